@@ -1,32 +1,39 @@
 #!/usr/bin/env python3
 """
 Script to remove all unused methods identified by flutter analyze
+
+Reads the analyzer output (analyze.txt by default), resolves every
+unused_element / unused_field diagnostic to its declaration in the current
+source, and removes them all bottom-up in one pass per file. Each diagnostic
+is resolved by name and position to the one declaration it points at (the
+innermost one containing its line and column, else the nearest one with that
+name), so a getter's setter or a same-named member elsewhere is left alone.
+
+Usage:
+    flutter analyze > analyze.txt
+    python remove_unused.py [analyze.txt] [--apply]
 """
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'tools'))
+from analyzer_report import build_index, remove_unused
+
+args = [a for a in sys.argv[1:] if not a.startswith('--')]
+report = args[0] if args else 'analyze.txt'
+apply = '--apply' in sys.argv
+
+with open(report, encoding='utf-8', errors='replace') as f:
+    index = build_index(f)
+
+removed = remove_unused(index, dry_run=not apply)
+total = sum(len(decls) for decls in removed.values())
+
+print("Unused declarations:")
+for path, decls in removed.items():
+    for decl in decls:
+        print(f"  {path}:{decl.start_line}: {decl.qualified_name}")
 
-# Dashboard unused methods with their line numbers (from most recent error output)
-DASHBOARD_UNUSED = [
-    (2532, "_buildDeltaChipWithSparkline"),
-    (2650, "_buildEnhancedGradeBadge"),
-    (2674, "_buildQuieterDeltaChip"),
-    (2730, "_getMainDriverText"),
-    (2790, "_buildGradeBadge"),
-    (2848, "_buildDeltaChip"),
-    (2904, "_buildTimeframeChip"),
-    (3025, "_getConfidenceColor"),
-    (3093, "_buildEnhancedTrendIndicator"),
-    (3136, "_hasIncompleteData"),
-    (3143, "_showScoreTooltip"),
-    (3693, "_getGradeColorForDiversification"),
-    (3708, "_buildTrendIndicator"),
-    (3738, "_getScoreGradientColors"),
-    (3774, "_showScoreDetailsSheet"),
-    (3832, "_showScoreQuickActions"),
-]
-
-print("Unused methods to remove from dashboard:")
-for line, method in DASHBOARD_UNUSED:
-    print(f"  Line {line}: {method}")
-
-print(f"\nTotal: {len(DASHBOARD_UNUSED)} methods")
-print("\nNOTE: These line numbers may shift as methods are removed.")
-print("Recommendation: Remove methods from bottom to top to preserve line numbers.")
+print(f"\nTotal: {total} declarations in {len(removed)} files")
+if not apply:
+    print("\nDry run (diff above). Re-run with --apply to remove them.")
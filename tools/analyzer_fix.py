@@ -0,0 +1,293 @@
+"""
+Bulk auto-fixer for analyzer diagnostics.
+
+Consumes a parsed analyzer report (see analyzer_report.py) and patches only
+the reported file:line:col spans. Work is grouped per file: each file is read
+once, its edits are applied bottom-up so earlier positions stay valid, and it
+is written once. Diagnostics whose span no longer holds the expected code
+(the report is older than the source) are skipped, not guessed at.
+
+Fixers:
+    deprecated_member_use 'withOpacity'  x.withOpacity(a) -> x.withValues(alpha: a)
+    avoid_print                          print(...) -> debugPrint(...)
+
+Usage:
+    python tools/analyzer_fix.py analyze.txt [--rule RULE ...] [--dry-run]
+"""
+from collections import Counter, defaultdict
+import argparse
+import os
+import re
+import sys
+
+from analyzer_report import parse
+from codemod import read_source, encode_source, unified_diff
+from dart_outline import Outline
+from fsutil import atomic_write
+
+FOUNDATION_IMPORT = "import 'package:flutter/foundation.dart';\n"
+# Any of these already exports debugPrint, unless a prefix or show/hide hides it.
+_DEBUG_PRINT_IMPORTS = re.compile(
+    r"^import 'package:flutter/(?:foundation|material|widgets|cupertino)\.dart'([^;]*);", re.M)
+_SIMPLE_IDENT = re.compile(r'^[A-Za-z_]\w*$')
+_STRING_START = re.compile(r"^r?['\"]")
+
+FIXERS = {}
+
+
+def fixer(rule, symbol=None):
+    def register(func):
+        FIXERS[(rule, symbol)] = func
+        return func
+    return register
+
+
+def find_fixer(diag):
+    return FIXERS.get((diag.rule, diag.symbol)) or FIXERS.get((diag.rule, None))
+
+
+class Edit:
+    __slots__ = ('start', 'end', 'replacement', 'needs_import')
+
+    def __init__(self, start, end, replacement, needs_import=None):
+        self.start = start
+        self.end = end
+        self.replacement = replacement
+        self.needs_import = needs_import
+
+
+def locate(outline, diag, token):
+    """Offset of token at the reported position.
+
+    Falls back to the only occurrence of token on the reported line (columns
+    are UTF-16 based, so lines with emoji can be off by a few). None if stale.
+    """
+    offset = outline.offset_of(diag.line, diag.col)
+    if outline.masked.startswith(token, offset):
+        return offset
+    line_start = outline.offset_of(diag.line, 1)
+    line = outline.masked[line_start:line_start + len(outline.line_text(diag.line))]
+    hits = [m.start() for m in re.finditer(re.escape(token) + r'\b', line)]
+    if len(hits) == 1:
+        return line_start + hits[0]
+    return None
+
+
+def _call_args(outline, name_end):
+    """(open, close) offsets of the argument list starting right after name_end."""
+    open_ = name_end
+    while open_ < len(outline.masked) and outline.masked[open_] in ' \t\n':
+        open_ += 1
+    if outline.masked[open_:open_ + 1] != '(':
+        return None
+    depth = 0
+    for k in range(open_, len(outline.masked)):
+        c = outline.masked[k]
+        if c in '([{':
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+            if depth == 0:
+                return open_, k
+    return None
+
+
+@fixer('deprecated_member_use', 'withOpacity')
+def fix_with_opacity(outline, diag):
+    start = locate(outline, diag, 'withOpacity')
+    if start is None:
+        return None
+    args = _call_args(outline, start + len('withOpacity'))
+    if args is None:
+        return None
+    open_, close = args
+    arg = outline.text[open_ + 1:close].strip().rstrip(',').strip()
+    return Edit(start, close + 1, f'withValues(alpha: {arg})')
+
+
+def _string_literal_end(text, i):
+    """Offset just past the Dart string literal starting at i, or None if it does not close."""
+    raw = text[i] == 'r'
+    if raw:
+        i += 1
+    quote = text[i]
+    delim = quote * 3 if text.startswith(quote * 3, i) else quote
+    j = i + len(delim)
+    while j < len(text):
+        if text.startswith(delim, j):
+            return j + len(delim)
+        c = text[j]
+        if c == '\\' and not raw:
+            j += 2
+        elif c == '\n' and len(delim) == 1:
+            return None
+        elif text.startswith('${', j) and not raw:
+            depth = 1
+            j += 2
+            while j < len(text) and depth:
+                if text[j] in '\'"':
+                    end = _string_literal_end(text, j)
+                    if end is None:
+                        return None
+                    j = end
+                    continue
+                depth += {'{': 1, '}': -1}.get(text[j], 0)
+                j += 1
+        else:
+            j += 1
+    return None
+
+
+def is_string_literal(arg):
+    """True when arg is one string literal, or several adjacent ones ('a' 'b')."""
+    i = 0
+    found = False
+    while True:
+        while i < len(arg) and arg[i].isspace():
+            i += 1
+        if i == len(arg):
+            return found
+        if not _STRING_START.match(arg[i:]):
+            return False
+        i = _string_literal_end(arg, i)
+        if i is None:
+            return False
+        found = True
+
+
+@fixer('avoid_print')
+def fix_print(outline, diag):
+    start = locate(outline, diag, 'print')
+    if start is None or outline.masked[start - 1:start] in ('.', '_') or outline.masked[start - 1:start].isalnum():
+        return None
+    args = _call_args(outline, start + len('print'))
+    if args is None:
+        return None
+    open_, close = args
+    arg = outline.text[open_ + 1:close].strip().rstrip(',').strip()
+    if is_string_literal(arg):
+        return Edit(start, start + len('print'), 'debugPrint', FOUNDATION_IMPORT)
+    # debugPrint takes a String?, print takes any Object?.
+    wrapped = f"'${arg}'" if _SIMPLE_IDENT.match(arg) else f"'${{{arg}}}'"
+    return Edit(start, close + 1, f'debugPrint({wrapped})', FOUNDATION_IMPORT)
+
+
+def _imports_debug_print(text):
+    """True when an unprefixed Flutter import makes debugPrint visible."""
+    for m in _DEBUG_PRINT_IMPORTS.finditer(text):
+        words = re.findall(r'\w+', m.group(1))
+        if 'as' in words:
+            continue
+        shown, hidden, combinator = [], set(), None
+        for word in words:
+            if word in ('show', 'hide'):
+                combinator = word
+                if word == 'show':
+                    shown.append(set())
+            elif combinator == 'show':
+                shown[-1].add(word)
+            elif combinator == 'hide':
+                hidden.add(word)
+        if 'debugPrint' not in hidden and all('debugPrint' in names for names in shown):
+            return True
+    return False
+
+
+def _add_import(text, line):
+    if line in text or (line == FOUNDATION_IMPORT and _imports_debug_print(text)):
+        return text
+    imports = list(re.finditer(r"^import '([^']+)';\n", text, re.M))
+    if not imports:
+        return line + text
+    # After the dart: imports, before the first package import.
+    for m in imports:
+        if not m.group(1).startswith('dart:'):
+            return text[:m.start()] + line + text[m.start():]
+    last = imports[-1]
+    return text[:last.end()] + line + text[last.end():]
+
+
+def fix_file(path, diags, root='.', dry_run=False):
+    """Apply all fixable diagnostics for one file. Returns Counter of (rule, outcome)."""
+    outcomes = Counter()
+    full = os.path.join(root, path)
+    if not os.path.exists(full):
+        outcomes.update((d.rule, 'missing file') for d in diags)
+        return outcomes
+    text, newline = read_source(full)
+    outline = Outline(text)
+    edits = []
+    for diag in diags:
+        edit = find_fixer(diag)(outline, diag)
+        if edit is None:
+            outcomes[(diag.rule, 'stale')] += 1
+        else:
+            edits.append((edit, diag))
+
+    # Bottom-up, dropping duplicates/overlaps (a report can repeat a span).
+    kept = []
+    imports = set()
+    floor = len(text) + 1
+    for edit, diag in sorted(edits, key=lambda e: e[0].start, reverse=True):
+        if edit.end > floor:
+            outcomes[(diag.rule, 'overlap')] += 1
+            continue
+        kept.append(edit)
+        floor = edit.start
+        outcomes[(diag.rule, 'fixed')] += 1
+        if edit.needs_import:
+            imports.add(edit.needs_import)
+    # Splice the kept edits in one pass, top-down.
+    pieces = []
+    last = 0
+    for edit in reversed(kept):
+        pieces.append(text[last:edit.start])
+        pieces.append(edit.replacement)
+        last = edit.end
+    pieces.append(text[last:])
+    new_text = ''.join(pieces)
+    for line in sorted(imports):
+        new_text = _add_import(new_text, line)
+
+    if new_text != text:
+        if dry_run:
+            sys.stdout.write(unified_diff(path, text, new_text))
+        else:
+            atomic_write(full, encode_source(new_text, newline))
+    return outcomes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Auto-fix analyzer diagnostics in place.')
+    parser.add_argument('report', help="analyzer output file, or '-' for stdin")
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--rule', action='append', help='only fix these rules (repeatable)')
+    parser.add_argument('--dry-run', action='store_true', help='print a diff instead of writing')
+    args = parser.parse_args(argv)
+
+    report = sys.stdin if args.report == '-' else open(args.report, encoding='utf-8', errors='replace')
+    per_file = defaultdict(list)
+    outcomes = Counter()
+    with report:
+        for diag in parse(report):
+            if args.rule and diag.rule not in args.rule:
+                continue
+            if find_fixer(diag) is None:
+                outcomes[(diag.rule, 'no fixer')] += 1
+            else:
+                per_file[diag.path].append(diag)
+
+    for path, diags in sorted(per_file.items()):
+        outcomes.update(fix_file(path, diags, args.root, args.dry_run))
+
+    fixed = sum(n for (_, outcome), n in outcomes.items() if outcome == 'fixed')
+    skipped = sum(outcomes.values()) - fixed
+    for (rule, outcome), n in sorted(outcomes.items()):
+        print(f'  {rule}: {outcome} {n}', file=sys.stderr)
+    verb = 'would fix' if args.dry_run else 'fixed'
+    print(f'{len(per_file)} files, {fixed} {verb}, {skipped} skipped', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
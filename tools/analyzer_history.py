@@ -0,0 +1,270 @@
+"""
+Keep a history of analyzer runs in SQLite and diff them.
+
+Each diagnostic gets a fingerprint of rule + normalized file path + enclosing
+declaration (see analyzer_report.resolve) + message, so an issue keeps its
+identity when a codemod or an edit above it only moves its line. A run
+stores how many times each fingerprint occurred and the sorted lines it was
+reported at; `moved` counts only the occurrences whose line changed.
+Reports are parsed line by line, so diagnostics are never materialized as
+a list; ingest keeps only each fingerprint's lines (and the outlines of the
+files it resolved against) until the run is written. Diffs are streamed
+straight from indexed queries.
+
+The store defaults to tools/.cache/analyzer_history.db.
+
+Usage:
+    flutter analyze > analyze.txt
+    python tools/analyzer_history.py ingest analyze.txt [--label "after codemod"]
+    flutter analyze | python tools/analyzer_history.py ingest -
+    python tools/analyzer_history.py runs
+    python tools/analyzer_history.py diff [OLD_RUN [NEW_RUN]] [--only new|fixed|moved] [--json]
+    python tools/analyzer_history.py trend [--by rule|file] [--last 10]
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+from analyzer_report import OutlineCache, parse, resolve
+
+DEFAULT_DB = Path(__file__).resolve().parent / '.cache' / 'analyzer_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    label TEXT,
+    source TEXT,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    severity TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    path TEXT NOT NULL,
+    anchor TEXT,
+    message TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    fp_id INTEGER NOT NULL REFERENCES fingerprints(id),
+    count INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    lines TEXT,
+    PRIMARY KEY (run_id, fp_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS occurrences_fp ON occurrences(fp_id, run_id);
+CREATE INDEX IF NOT EXISTS fingerprints_rule ON fingerprints(rule);
+CREATE INDEX IF NOT EXISTS fingerprints_path ON fingerprints(path);
+"""
+
+
+def fingerprint(diag):
+    key = '\0'.join((diag.rule, diag.path, diag.anchor or '', diag.message))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def connect(path=DEFAULT_DB):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.execute('PRAGMA foreign_keys = ON')
+    db.execute('PRAGMA journal_mode = WAL')
+    db.executescript(SCHEMA)
+    if 'lines' not in {row['name'] for row in db.execute('PRAGMA table_info(occurrences)')}:
+        db.execute('ALTER TABLE occurrences ADD COLUMN lines TEXT')  # histories from before per-line storage
+    return db
+
+
+def ingest(db, lines, root='.', label=None, source=None):
+    """Store one run from report lines. Returns (run id, diagnostic count)."""
+    outlines = OutlineCache(root)
+    fp_ids = {}
+    lines_by_fp = {}  # fp id -> lines reported at
+    total = 0
+    with db:
+        run_id = db.execute('INSERT INTO runs (created, label, source) VALUES (?, ?, ?)',
+                            (datetime.datetime.now().isoformat(timespec='seconds'), label, source)).lastrowid
+        for diag in parse(lines):
+            outline = outlines.get(diag.path)
+            if outline is not None:
+                resolve(diag, outline)
+            fp = fingerprint(diag)
+            fp_id = fp_ids.get(fp)
+            if fp_id is None:
+                db.execute('INSERT OR IGNORE INTO fingerprints '
+                           '(fingerprint, severity, rule, path, anchor, message) VALUES (?, ?, ?, ?, ?, ?)',
+                           (fp, diag.severity, diag.rule, diag.path, diag.anchor, diag.message))
+                fp_id = fp_ids[fp] = db.execute('SELECT id FROM fingerprints WHERE fingerprint = ?',
+                                                (fp,)).fetchone()[0]
+            lines_by_fp.setdefault(fp_id, []).append(diag.line)
+            total += 1
+        db.executemany('INSERT INTO occurrences (run_id, fp_id, count, line, lines) VALUES (?, ?, ?, ?, ?)',
+                       ((run_id, fp_id, len(lines), min(lines), ','.join(map(str, sorted(lines))))
+                        for fp_id, lines in lines_by_fp.items()))
+        db.execute('UPDATE runs SET total = ? WHERE id = ?', (total, run_id))
+    return run_id, total
+
+
+def latest_runs(db, n=2):
+    return [row[0] for row in db.execute('SELECT id FROM runs ORDER BY id DESC LIMIT ?', (n,))][::-1]
+
+
+_DIFF_SQL = {
+    # In `new` but not (or fewer times) in `old`.
+    'new': """
+        SELECT f.*, n.count - COALESCE(o.count, 0) AS delta, n.line AS line
+        FROM occurrences n JOIN fingerprints f ON f.id = n.fp_id
+        LEFT JOIN occurrences o ON o.run_id = :old AND o.fp_id = n.fp_id
+        WHERE n.run_id = :new AND n.count > COALESCE(o.count, 0)
+        ORDER BY f.path, n.line""",
+    'fixed': """
+        SELECT f.*, o.count - COALESCE(n.count, 0) AS delta, o.line AS line
+        FROM occurrences o JOIN fingerprints f ON f.id = o.fp_id
+        LEFT JOIN occurrences n ON n.run_id = :new AND n.fp_id = o.fp_id
+        WHERE o.run_id = :old AND o.count > COALESCE(n.count, 0)
+        ORDER BY f.path, o.line""",
+    # Same issue in both runs with a different set of lines; see _moved().
+    'moved': """
+        SELECT f.*, n.count AS count, n.line AS line, n.lines AS lines,
+               o.count AS old_count, o.line AS old_line, o.lines AS old_lines
+        FROM occurrences n JOIN occurrences o ON o.run_id = :old AND o.fp_id = n.fp_id
+        JOIN fingerprints f ON f.id = n.fp_id
+        WHERE n.run_id = :new AND COALESCE(n.lines, n.line) != COALESCE(o.lines, o.line)
+        ORDER BY f.path, n.line""",
+}
+
+
+def _moved(row):
+    """A moved row: occurrences present in both runs whose line is not in the other run."""
+    if row['lines'] is None or row['old_lines'] is None:
+        # A run stored before per-line storage only knows its first line.
+        new_lines, old_lines = Counter([row['line']]), Counter([row['old_line']])
+        shared = 1
+    else:
+        new_lines = Counter(int(n) for n in row['lines'].split(','))
+        old_lines = Counter(int(n) for n in row['old_lines'].split(','))
+        shared = min(row['count'], row['old_count'])
+    moved = shared - sum((new_lines & old_lines).values())
+    if moved <= 0:
+        return None
+    out = {k: row[k] for k in row.keys() if k not in ('count', 'old_count')}
+    out['lines'] = sorted((new_lines - old_lines).elements())[:moved]
+    out['old_lines'] = sorted((old_lines - new_lines).elements())[:moved]
+    out.update(delta=moved, line=out['lines'][0], old_line=out['old_lines'][0])
+    return out
+
+
+def diff(db, old, new, kind):
+    """Yield rows of one diff section between two runs."""
+    rows = db.execute(_DIFF_SQL[kind], {'old': old, 'new': new})
+    if kind != 'moved':
+        yield from rows
+        return
+    for row in rows:
+        moved = _moved(row)
+        if moved is not None:
+            yield moved
+
+
+def trend(db, by='rule', last=10):
+    """{key: {run id: count}} for the last runs, plus the run ids in order."""
+    runs = latest_runs(db, last)
+    if not runs:
+        return runs, {}
+    column = 'f.rule' if by == 'rule' else 'f.path'
+    rows = db.execute(f"""
+        SELECT {column} AS key, o.run_id, SUM(o.count) AS n
+        FROM occurrences o JOIN fingerprints f ON f.id = o.fp_id
+        WHERE o.run_id >= ?
+        GROUP BY key, o.run_id""", (runs[0],))
+    table = {}
+    for row in rows:
+        table.setdefault(row['key'], {})[row['run_id']] = row['n']
+    return runs, table
+
+
+def _open_report(name):
+    if name == '-':
+        return sys.stdin
+    return open(name, encoding='utf-8', errors='replace')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SQLite history of analyzer runs.')
+    parser.add_argument('--db', default=str(DEFAULT_DB))
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('ingest')
+    p.add_argument('report', help="analyzer output file, or '-' for stdin")
+    p.add_argument('--root', default='.', help='project root the report paths are relative to')
+    p.add_argument('--label')
+    sub.add_parser('runs')
+    p = sub.add_parser('diff')
+    p.add_argument('runs', type=int, nargs='*', help='OLD [NEW]; default: the last two runs')
+    p.add_argument('--only', choices=sorted(_DIFF_SQL), action='append')
+    p.add_argument('--json', action='store_true', help='one JSON object per changed fingerprint')
+    p = sub.add_parser('trend')
+    p.add_argument('--by', choices=('rule', 'file'), default='rule')
+    p.add_argument('--last', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    if args.command == 'ingest':
+        with _open_report(args.report) as f:
+            run_id, total = ingest(db, f, args.root, args.label,
+                                   None if args.report == '-' else os.path.abspath(args.report))
+        print(f'Run {run_id}: {total} diagnostics')
+        return 0
+
+    if args.command == 'runs':
+        for row in db.execute('SELECT * FROM runs ORDER BY id'):
+            label = f"  {row['label']}" if row['label'] else ''
+            print(f"{row['id']:4d}  {row['created']}  {row['total']:6d} diagnostics{label}")
+        return 0
+
+    if args.command == 'diff':
+        runs = args.runs[:2]
+        if len(runs) < 2:
+            runs = (runs + latest_runs(db, 1)) if runs else latest_runs(db)
+        if len(runs) != 2 or runs[0] == runs[1]:
+            print('Need two runs to diff; ingest another report first', file=sys.stderr)
+            return 1
+        old, new = runs
+        totals = {}
+        for kind in args.only or ('new', 'fixed', 'moved'):
+            totals[kind] = 0
+            for row in diff(db, old, new, kind):
+                totals[kind] += row['delta']
+                if args.json:
+                    print(json.dumps(dict(row, change=kind)))
+                else:
+                    where = f"{row['path']}:{row['line']}"
+                    if kind == 'moved':
+                        old_lines = ','.join(map(str, row['old_lines']))
+                        where = f"{row['path']}:{old_lines}->{','.join(map(str, row['lines']))}"
+                    times = f" x{row['delta']}" if row['delta'] > 1 else ''
+                    print(f"{kind:<5}  {where}  {row['rule']}{times}  @ {row['anchor'] or '-'}")
+        summary = ', '.join(f'{n} {kind}' for kind, n in totals.items())
+        print(f'Run {old} -> {new}: {summary}', file=sys.stderr)
+        return 0
+
+    runs, table = trend(db, args.by, args.last)
+    if not runs:
+        print('No runs ingested yet', file=sys.stderr)
+        return 1
+    print('  '.join(f'{r:>6}' for r in runs) + '  ' + args.by)
+    for key, per_run in sorted(table.items(), key=lambda kv: -kv[1].get(runs[-1], 0)):
+        print('  '.join(f'{per_run.get(r, 0):>6}' for r in runs) + f'  {key}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Streaming parser and index for `flutter analyze` / `dart analyze` output.
+
+Each diagnostic is resolved to a stable anchor (the enclosing declaration, e.g.
+`_NetWorthHistorySheetState._storeSavedComparison`) so it can still be found
+after the reported line numbers have drifted. Unused-declaration diagnostics
+can be removed in bulk: every affected file is read once and cut bottom-up.
+
+Usage:
+    python tools/analyzer_report.py analyze.txt [--group rule|file|symbol|anchor]
+    python tools/analyzer_report.py analyze.txt --json
+    python tools/analyzer_report.py analyze.txt --remove-unused [--dry-run]
+    flutter analyze | python tools/analyzer_report.py -
+"""
+from collections import Counter, defaultdict
+import argparse
+import json
+import os
+import re
+import sys
+
+from codemod import read_source, encode_source, unified_diff
+from dart_outline import Outline
+from fsutil import atomic_write
+
+# `info - lib\foo.dart:12:7 - Message text. - rule_name`
+_DASH_LINE = re.compile(
+    r'^\s*(info|warning|error)\s+-\s+(.+?):(\d+):(\d+)\s+-\s+(.*)\s+-\s+([a-z0-9_]+)\s*$')
+# Newer SDKs: `info • Message text • lib/foo.dart:12:7 • rule_name`
+_BULLET_LINE = re.compile(
+    r'^\s*(info|warning|error)\s+•\s+(.*)\s+•\s+(.+?):(\d+):(\d+)\s+•\s+([a-z0-9_]+)\s*$')
+_QUOTED = re.compile(r"'([^']+)'")
+
+# Rules whose quoted symbol names the declaration being reported.
+DECLARATION_RULES = frozenset({
+    'unused_element',
+    'unused_field',
+    'unused_element_parameter',
+})
+REMOVABLE_RULES = frozenset({'unused_element', 'unused_field'})
+
+
+def normalize_path(path):
+    path = path.strip().replace('\\', '/')
+    while path.startswith('./'):
+        path = path[2:]
+    return path
+
+
+class Diagnostic:
+    __slots__ = ('severity', 'path', 'line', 'col', 'message', 'rule', 'symbol',
+                 'anchor', 'signature', 'declaration')
+
+    def __init__(self, severity, path, line, col, message, rule):
+        self.severity = severity
+        self.path = normalize_path(path)
+        self.line = line
+        self.col = col
+        self.message = message.strip()
+        self.rule = rule
+        m = _QUOTED.search(self.message)
+        self.symbol = m.group(1) if m else None
+        self.anchor = None
+        self.signature = None
+        self.declaration = None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'declaration'}
+
+    def __repr__(self):
+        return f'<{self.rule} {self.path}:{self.line}:{self.col} @ {self.anchor}>'
+
+
+def parse_line(line):
+    m = _DASH_LINE.match(line)
+    if m:
+        severity, path, ln, col, message, rule = m.groups()
+        return Diagnostic(severity, path, int(ln), int(col), message, rule)
+    m = _BULLET_LINE.match(line)
+    if m:
+        severity, message, path, ln, col, rule = m.groups()
+        return Diagnostic(severity, path, int(ln), int(col), message, rule)
+    return None
+
+
+def parse(lines):
+    """Yield Diagnostics from an iterable of report lines; other lines are ignored."""
+    for line in lines:
+        diag = parse_line(line)
+        if diag is not None:
+            yield diag
+
+
+class OutlineCache:
+    """Load each source file's Outline at most once."""
+
+    def __init__(self, root='.'):
+        self.root = root
+        self._outlines = {}
+
+    def get(self, path):
+        if path not in self._outlines:
+            full = os.path.join(self.root, path)
+            self._outlines[path] = Outline.from_path(full) if os.path.exists(full) else None
+        return self._outlines[path]
+
+
+def declaration_at(outline, name, line, col=1):
+    """The one declaration called name that the position points into.
+
+    Same-named declarations (a getter/setter pair, overloads in different
+    classes) are told apart by position: the innermost one whose span contains
+    it wins, otherwise the one starting nearest to the reported line.
+    """
+    candidates = outline.find(name)
+    if not candidates:
+        return None
+    offset = outline.offset_of(line, col)
+    containing = [d for d in candidates if d.start <= offset and d.end is not None and offset < d.end]
+    if containing:
+        return max(containing, key=lambda d: d.start)
+    return min(candidates, key=lambda d: (abs(d.start_line - line), d.start))
+
+
+def resolve(diag, outline):
+    """Attach the enclosing (or, for unused-declaration rules, the named) declaration."""
+    decl = None
+    if diag.rule in DECLARATION_RULES and diag.symbol:
+        decl = declaration_at(outline, diag.symbol, diag.line, diag.col)
+    if decl is None:
+        decl = outline.enclosing(outline.offset_of(diag.line, diag.col))
+    if decl is not None:
+        diag.declaration = decl
+        diag.anchor = decl.qualified_name
+        diag.signature = decl.signature
+    return diag
+
+
+class Index:
+    def __init__(self):
+        self.diagnostics = []
+        self.by_file = defaultdict(list)
+        self.by_rule = defaultdict(list)
+        self.by_symbol = defaultdict(list)
+        self.by_anchor = defaultdict(list)
+
+    def add(self, diag):
+        self.diagnostics.append(diag)
+        self.by_file[diag.path].append(diag)
+        self.by_rule[diag.rule].append(diag)
+        if diag.symbol:
+            self.by_symbol[diag.symbol].append(diag)
+        if diag.anchor:
+            self.by_anchor[f'{diag.path}::{diag.anchor}'].append(diag)
+
+    def group(self, key):
+        return {'file': self.by_file, 'rule': self.by_rule,
+                'symbol': self.by_symbol, 'anchor': self.by_anchor}[key]
+
+
+def build_index(lines, root='.', outlines=None):
+    outlines = outlines or OutlineCache(root)
+    index = Index()
+    for diag in parse(lines):
+        outline = outlines.get(diag.path)
+        if outline is not None:
+            resolve(diag, outline)
+        index.add(diag)
+    return index
+
+
+def cut_spans(text, spans):
+    """Remove (start, end) spans from text in one pass, merging overlaps."""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    pieces = []
+    last = 0
+    for start, end in merged:
+        pieces.append(text[last:start])
+        last = end
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
+
+def remove_declarations(path, positions, root='.', dry_run=False):
+    """Remove the declarations reported at (name, line, col) positions in one file.
+
+    Each position selects a single declaration, so a getter/setter pair or
+    other same-named members are only removed when each one was flagged.
+    Returns the removed declarations.
+    """
+    full = os.path.join(root, path)
+    text, newline = read_source(full)
+    outline = Outline(text)
+    decls = []
+    for name, line, col in positions:
+        decl = declaration_at(outline, name, line, col)
+        if decl is not None and decl not in decls:
+            decls.append(decl)
+    if not decls:
+        return []
+    new_text = cut_spans(text, [outline.removal_span(d) for d in decls])
+    if dry_run:
+        sys.stdout.write(unified_diff(path, text, new_text))
+    else:
+        atomic_write(full, encode_source(new_text, newline))
+    return decls
+
+
+def remove_unused(index, root='.', dry_run=False):
+    """Remove every declaration flagged by an unused-declaration rule. Returns {path: [decl]}."""
+    targets = defaultdict(set)
+    for rule in REMOVABLE_RULES:
+        for diag in index.by_rule.get(rule, ()):
+            if diag.declaration is not None and diag.declaration.name == diag.symbol:
+                targets[diag.path].add((diag.symbol, diag.line, diag.col))
+    return {path: remove_declarations(path, sorted(positions), root, dry_run)
+            for path, positions in sorted(targets.items())}
+
+
+def _open_report(name):
+    if name == '-':
+        return sys.stdin
+    return open(name, encoding='utf-8', errors='replace')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Parse and index analyzer output.')
+    parser.add_argument('report', help="analyzer output file, or '-' for stdin")
+    parser.add_argument('--root', default='.', help='project root the report paths are relative to')
+    parser.add_argument('--group', choices=('rule', 'file', 'symbol', 'anchor'), default='rule')
+    parser.add_argument('--json', action='store_true', help='emit one JSON object per diagnostic')
+    parser.add_argument('--remove-unused', action='store_true',
+                        help='delete declarations reported by ' + ', '.join(sorted(REMOVABLE_RULES)))
+    parser.add_argument('--dry-run', action='store_true', help='with --remove-unused, print a diff')
+    args = parser.parse_args(argv)
+
+    with _open_report(args.report) as f:
+        index = build_index(f, args.root)
+
+    if args.json:
+        for diag in index.diagnostics:
+            print(json.dumps(diag.to_dict()))
+        return 0
+
+    if args.remove_unused:
+        removed = remove_unused(index, args.root, args.dry_run)
+        total = 0
+        for path, decls in removed.items():
+            for decl in decls:
+                print(f'{path}:{decl.start_line}: {decl.qualified_name}', file=sys.stderr)
+            total += len(decls)
+        verb = 'Would remove' if args.dry_run else 'Removed'
+        print(f'{verb} {total} declaration(s) in {len(removed)} file(s)', file=sys.stderr)
+        return 0
+
+    groups = index.group(args.group)
+    for key, diags in sorted(groups.items(), key=lambda kv: (-len(kv[1]), kv[0])):
+        rules = Counter(d.rule for d in diags)
+        detail = ', '.join(f'{r} x{n}' for r, n in rules.most_common())
+        print(f'{len(diags):5d}  {key}  ({detail})')
+    unresolved = sum(1 for d in index.diagnostics if d.anchor is None)
+    print(f'{len(index.diagnostics)} diagnostics, {unresolved} without an anchor')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
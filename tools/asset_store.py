@@ -0,0 +1,160 @@
+"""
+Content-addressed writes and duplicate reporting for generated assets.
+
+AssetStore.put() hashes what it is asked to write and:
+  - skips the write when the destination already holds those exact bytes,
+  - hard-links the destination to an earlier output with the same content
+    (when link_duplicates is on) instead of writing a second copy,
+  - otherwise writes atomically.
+AssetStore.derive() copies a source verbatim when it is already the requested
+size, so no-op resizes never re-encode.
+
+Usage:
+    python tools/asset_store.py report [assets ...] [--json]
+    python tools/asset_store.py link [assets ...]      # hard-link duplicates in place
+"""
+from collections import defaultdict
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from fsutil import atomic_write, digest_bytes, digest_file
+
+
+class AssetStore:
+    def __init__(self, link_duplicates=False):
+        self.link_duplicates = link_duplicates
+        self._paths_by_digest = {}
+        self.counts = {'written': 0, 'unchanged': 0, 'linked': 0}
+
+    def _record(self, path, digest, outcome):
+        self._paths_by_digest.setdefault(digest, str(path))
+        self.counts[outcome] += 1
+        return digest, outcome
+
+    def put(self, path, data):
+        """Store bytes at path. Returns (digest, 'written' | 'unchanged' | 'linked')."""
+        digest = digest_bytes(data)
+        if os.path.exists(path) and os.path.getsize(path) == len(data) and digest_file(path) == digest:
+            return self._record(path, digest, 'unchanged')
+        existing = self._paths_by_digest.get(digest)
+        if self.link_duplicates and existing and existing != str(path) and os.path.exists(existing):
+            try:
+                hard_link(existing, path)
+                return self._record(path, digest, 'linked')
+            except OSError:
+                pass  # cross-device or unsupported filesystem; fall back to a copy
+        atomic_write(path, data)
+        return self._record(path, digest, 'written')
+
+    def put_file(self, src, path):
+        """Store an existing file's bytes at path without decoding it."""
+        with open(src, 'rb') as f:
+            data = f.read()
+        self._paths_by_digest.setdefault(digest_bytes(data), str(src))
+        return self.put(path, data)
+
+    def derive(self, src, path, size, resample=None, fmt='PNG'):
+        """Write src resized to size; a source already at that size is copied verbatim."""
+        from PIL import Image
+
+        with Image.open(src) as im:
+            if im.size == tuple(size) and im.format == fmt:
+                return self.put_file(src, path)
+            im = im.resize(tuple(size), resample or Image.LANCZOS)
+            buf = io.BytesIO()
+            im.save(buf, fmt)
+        return self.put(path, buf.getvalue())
+
+
+def hard_link(src, dest):
+    """Atomically replace dest with a hard link to src."""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix='.link-', dir=dest.parent)) / dest.name
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+        tmp.parent.rmdir()
+
+
+def find_duplicates(roots):
+    """Group files under roots by content. Returns [[path, ...]] with 2+ paths each."""
+    by_size = defaultdict(list)
+    for root in roots:
+        root = Path(root)
+        files = [root] if root.is_file() else (p for p in root.rglob('*') if p.is_file())
+        for path in files:
+            by_size[path.stat().st_size].append(path)
+    groups = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue  # a unique size cannot have a duplicate; skip hashing it
+        by_digest = defaultdict(list)
+        for path in paths:
+            by_digest[digest_file(path)].append(path)
+        groups.extend(sorted(g) for g in by_digest.values() if len(g) > 1)
+    return sorted(groups)
+
+
+def _same_inode(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def wasted_bytes(groups):
+    """Bytes taken by extra copies, not counting paths that are already hard links."""
+    total = 0
+    for group in groups:
+        size = group[0].stat().st_size
+        distinct = []
+        for path in group:
+            if not any(_same_inode(path, other) for other in distinct):
+                distinct.append(path)
+        total += size * (len(distinct) - 1)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report or hard-link duplicate asset files.')
+    parser.add_argument('command', choices=('report', 'link'))
+    parser.add_argument('paths', nargs='*', default=['assets'])
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    groups = find_duplicates(args.paths)
+    wasted = wasted_bytes(groups)
+
+    if args.command == 'link':
+        linked = 0
+        for canonical, *copies in groups:
+            for path in copies:
+                if not _same_inode(canonical, path):
+                    hard_link(canonical, path)
+                    linked += 1
+        print(f'Linked {linked} duplicate(s), reclaimed {wasted} bytes')
+        return 0
+
+    if args.json:
+        print(json.dumps({
+            'groups': [{'size': g[0].stat().st_size, 'paths': [p.as_posix() for p in g]} for g in groups],
+            'wasted_bytes': wasted,
+        }, indent=2))
+        return 0
+    for group in groups:
+        print(f'{group[0].stat().st_size:>9}  ' + '  =  '.join(p.as_posix() for p in group))
+    print(f'{len(groups)} duplicate group(s), {wasted} bytes in extra copies')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Batch icon/image resizer driven by a size matrix (tools/icon_sizes.json).
+
+Each source is decoded once. Targets are produced from a cached chain of 2x
+box-filter reductions (source -> 1/2 -> 1/4 ...): every target is resampled
+with LANCZOS from the smallest level that is still at least twice its size,
+so a 48px launcher icon does not pay for a full-resolution resample. Sources
+run in parallel worker processes and encoding within a source runs on
+threads. Outputs go through AssetStore, so unchanged files are not rewritten.
+
+Fit rules match resize_image.py: the image is scaled down (never up) to fit
+the box, keeping its aspect ratio, and centered on a transparent canvas. A
+target is either a size (48 or [w, h]) or an object such as
+{"size": 192, "pad": 0.1, "background": "#2d2d2d"}: pad keeps that fraction
+of the box clear on every side (maskable icons need a 10% safe zone) and
+background fills the canvas instead of leaving it transparent.
+
+The manifest named in the matrix (tools/icon_manifest.json) records each
+output's source hash, target parameters and output hash. Outputs it vouches
+for are left byte for byte as they are, so a run never swaps hand-optimized
+icons for larger re-encodes; only new or stale targets are rendered (--force
+renders all). PNGs are saved optimized and, when the image fits in a palette
+without losing a pixel, as palette PNGs if that is smaller.
+
+Usage:
+    python tools/batch_resize.py [tools/icon_sizes.json] [--only SOURCE] [--jobs N] [--dry-run] [--force]
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageColor
+
+from asset_store import AssetStore
+from fsutil import atomic_write, digest_file
+
+DEFAULT_MATRIX = Path(__file__).resolve().parent / 'icon_sizes.json'
+FORMATS = {'.png': 'PNG', '.webp': 'WEBP', '.jpg': 'JPEG', '.jpeg': 'JPEG'}
+
+
+class Ladder:
+    """Lazily built chain of 2x reductions of one decoded image."""
+
+    def __init__(self, image):
+        self.levels = [image]
+
+    def base_for(self, size):
+        w, h = size
+        level = self.levels[0]
+        k = 0
+        while level.width >= 2 * w and level.height >= 2 * h:
+            k += 1
+            if k == len(self.levels):
+                self.levels.append(level.reduce(2))
+            level = self.levels[k]
+        return level
+
+
+def fit_size(src_size, box):
+    """Size of src scaled down (never up) to fit box, keeping aspect ratio."""
+    iw, ih = src_size
+    ratio = min(box[0] / iw, box[1] / ih, 1.0)
+    return max(1, round(iw * ratio)), max(1, round(ih * ratio))
+
+
+def fit(image, box, ladder=None, pad=0, background=None):
+    ladder = ladder or Ladder(image)
+    inner = (box[0] - 2 * round(box[0] * pad), box[1] - 2 * round(box[1] * pad))
+    size = fit_size(image.size, inner)
+    base = ladder.base_for(size)
+    img = base if base.size == size else base.resize(size, Image.LANCZOS)
+    if size == tuple(box):
+        return img
+    fill = ImageColor.getcolor(background, 'RGBA') if background else (255,255,255,0)
+    canvas = Image.new('RGBA', tuple(box), fill)
+    img = img.convert('RGBA')
+    canvas.paste(img, ((box[0] - img.width) // 2, (box[1] - img.height) // 2), img)
+    return canvas
+
+
+def _save(img, fmt, options):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    return buf.getvalue()
+
+
+def _palette(img):
+    """img as a palette image when that loses nothing, else None."""
+    if img.getcolors(256) is None:
+        return None
+    rgba = img.convert('RGBA')
+    pal = rgba.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    if ImageChops.difference(pal.convert('RGBA'), rgba).getbbox() is not None:
+        return None
+    return pal
+
+
+def encode(img, fmt, options=None):
+    options = dict(options or {})
+    if fmt == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    data = _save(img, fmt, options)
+    if fmt == 'PNG':
+        pal = _palette(img)
+        if pal is not None:
+            data = min(data, _save(pal, fmt, options), key=len)
+    return data
+
+
+def _target(value):
+    """(box, pad, background) for a matrix target."""
+    spec = value if isinstance(value, dict) else {'size': value}
+    size = spec['size']
+    box = (size, size) if isinstance(size, int) else tuple(size)
+    return box, spec.get('pad', 0), spec.get('background')
+
+
+def _box(value):
+    return _target(value)[0]
+
+
+def target_params(value, encode_options):
+    box, pad, background = _target(value)
+    return {'size': list(box), 'pad': pad, 'background': background, 'encode': encode_options}
+
+
+def load_manifest(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def is_current(path, entry, source_digest, params):
+    """True when the manifest entry vouches for the file on disk."""
+    if (not entry or entry.get('source_sha256') != source_digest
+            or entry.get('params') != params):
+        return False
+    try:
+        return digest_file(path) == entry.get('output_sha256')
+    except OSError:
+        return False
+
+
+def process_source(job, encode_options, dry_run=False):
+    """Produce every target for one source. Returns a list of result dicts."""
+    start = time.perf_counter()
+    with Image.open(job['source']) as im:
+        im.load()
+        source = im
+    decode_time = time.perf_counter() - start
+    ladder = Ladder(source)
+    # Largest first, so smaller targets reuse the reductions the bigger ones built.
+    targets = sorted(job['targets'].items(), key=lambda kv: -_box(kv[1])[0])
+    images = []
+    for path, value in targets:
+        box, pad, background = _target(value)
+        images.append((path, fit(source, box, ladder, pad, background)))
+
+    store = AssetStore()
+
+    def write(item):
+        path, img = item
+        t = time.perf_counter()
+        fmt = FORMATS[Path(path).suffix.lower()]
+        data = encode(img, fmt, encode_options.get(fmt.lower()))
+        before = os.path.getsize(path) if os.path.exists(path) else None
+        digest, outcome = (None, 'would write') if dry_run else store.put(path, data)
+        return {'source': job['source'], 'path': path, 'size': list(img.size), 'bytes': len(data),
+                'before': before, 'outcome': outcome, 'digest': digest,
+                'seconds': time.perf_counter() - t}
+
+    with ThreadPoolExecutor() as pool:
+        results = list(pool.map(write, images))
+    for result in results:
+        result['decode_seconds'] = decode_time
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resize sources to every size in a size matrix.')
+    parser.add_argument('matrix', nargs='?', default=str(DEFAULT_MATRIX))
+    parser.add_argument('--only', action='append', help='only process this source (repeatable)')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help='encode and report sizes without writing')
+    parser.add_argument('--force', action='store_true', help='re-render targets the manifest vouches for')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    matrix = json.loads(Path(args.matrix).read_text(encoding='utf-8'))
+    options = matrix.get('encode', {})
+    manifest_path = matrix.get('manifest', 'tools/icon_manifest.json')
+    manifest = load_manifest(manifest_path)
+    known = {path for job in matrix['sources'] for path in job['targets']}
+    outputs = {path: entry for path, entry in manifest.get('outputs', {}).items() if path in known}
+
+    jobs = []
+    current = []
+    for job in matrix['sources']:
+        if args.only and job['source'] not in args.only:
+            continue
+        source_digest = digest_file(job['source'])
+        stale = {}
+        for path, value in job['targets'].items():
+            fmt = FORMATS[Path(path).suffix.lower()]
+            params = target_params(value, options.get(fmt.lower()))
+            if not args.force and is_current(path, outputs.get(path), source_digest, params):
+                current.append(path)
+                continue
+            stale[path] = value
+            outputs[path] = {'source': job['source'], 'source_sha256': source_digest, 'params': params}
+        if stale:
+            jobs.append(dict(job, targets=stale))
+
+    if len(jobs) > 1 and (args.jobs or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(process_source, job, options, args.dry_run) for job in jobs]
+            results = [r for f in futures for r in f.result()]
+    else:
+        results = [r for job in jobs for r in process_source(job, options, args.dry_run)]
+
+    total_before = total_after = 0
+    for r in results:
+        if r['digest']:
+            outputs[r['path']]['output_sha256'] = r['digest']
+        before = '-' if r['before'] is None else f"{r['before']:>8}"
+        print(f"{r['outcome']:<11} {r['path']}  {r['size'][0]}x{r['size'][1]}  {before} -> {r['bytes']:>8} bytes")
+        total_before += r['before'] or 0
+        total_after += r['bytes']
+    print(f'{len(results)} targets from {len(jobs)} sources, {total_before} -> {total_after} bytes, '
+          f'{len(current)} current ({time.perf_counter() - started:.2f}s)')
+
+    new_manifest = {'outputs': dict(sorted(outputs.items()))}
+    if not args.dry_run and new_manifest != manifest:
+        atomic_write(manifest_path, (json.dumps(new_manifest, indent=2) + '\n').encode('utf-8'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
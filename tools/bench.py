@@ -0,0 +1,306 @@
+"""
+Benchmark the Python tooling on synthetic inputs.
+
+Generates Dart files of the requested sizes (widgets with context.mounted
+guards, print calls, withOpacity, doc comments and interpolated strings),
+matching analyzer reports, and a matrix of feature-graphic variants (every
+layout x a set of headlines) in a scratch directory. Each case then runs in
+a fresh interpreter, so peak RSS (getrusage ru_maxrss, the highest over
+the repeats) is per case; wall time is the best of --repeat runs and
+excludes interpreter start-up and input loading.
+
+Cases:
+    outline      dart_outline.Outline over the file
+    index        dart_index.index_source (outline + call sites + line table)
+    codemod      codemods/context_guards.json applied to the file
+    analyzer     analyzer_report.build_index over the synthetic report
+    fix          analyzer_fix.fix_file for every withOpacity/print diagnostic
+    assets       build_assets.render_variant for the variant matrix
+
+Results can be saved as a baseline and later runs compared against it;
+any case slower (or larger) than the baseline by more than --tolerance is
+reported and the exit status is 1. Everything runs offline.
+
+Usage:
+    python tools/bench.py [--sizes 10000 50000 200000] [--cases outline codemod ...]
+                          [--repeat 3] [--baseline tools/.cache/bench_baseline.json]
+                          [--save-baseline] [--tolerance 0.25] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = TOOLS_DIR / '.cache' / 'bench_baseline.json'
+DART_CASES = ('outline', 'index', 'codemod', 'analyzer', 'fix')
+ALL_CASES = DART_CASES + ('assets',)
+HEADLINES = ['Grow, stay\nbalanced.', 'Stay balanced.', 'Know your\nnet worth.',
+             'Rebalance with\nconfidence.', 'Every account,\none dial.']
+# Time deltas below this are treated as noise regardless of the tolerance.
+NOISE_SECONDS = 0.02
+
+_WIDGET = """\
+/// Synthetic screen {i} with a [Container] and "quoted" {{braces}} in docs.
+class SyntheticScreen{i} extends StatelessWidget {{
+  const SyntheticScreen{i}({{super.key}});
+
+  @override
+  Widget build(BuildContext context) {{
+    return Container(
+      color: Colors.blue.withOpacity(0.{shade}),
+      child: Text('Screen {i}: ${{_label{i}()}}'),
+    );
+  }}
+{methods}
+  String _label{i}() => 'value {i}';
+}}
+
+"""
+
+_METHOD = """
+  Future<void> _save{i}_{j}(BuildContext context, Map<String, dynamic> data) async {{
+    try {{
+      await Future<void>.delayed(const Duration(milliseconds: {j}));
+      if (context.mounted) {{
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('Saved {j} of ${{data.length}} items')),
+        );
+      }}
+    }} catch (e) {{
+      // Keep going; the next save retries.
+      print('Error saving comparison: $e');
+    }}
+  }}
+"""
+
+_HEADER = """\
+import 'package:flutter/material.dart';
+
+// Generated by tools/bench.py; not part of the app.
+
+"""
+
+
+def synthetic_dart(lines, seed=0):
+    """Deterministic Dart source of roughly the given number of lines."""
+    rng = random.Random(seed)
+    out = [_HEADER]
+    total = _HEADER.count('\n')
+    i = 0
+    while total < lines:
+        methods = ''.join(_METHOD.format(i=i, j=j) for j in range(rng.randint(1, 6)))
+        chunk = _WIDGET.format(i=i, shade=rng.randint(1, 9), methods=methods)
+        out.append(chunk)
+        total += chunk.count('\n')
+        i += 1
+    return ''.join(out)
+
+
+def synthetic_report(text, path):
+    """Analyzer output (dash format, Windows paths) for each withOpacity/print in text."""
+    win_path = path.replace('/', '\\')
+    line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+    out = ['Analyzing synthetic...', '']
+    patterns = [
+        (re.compile(r'\bwithOpacity\('), "'withOpacity' is deprecated and shouldn't be used. "
+         'Use .withValues() to avoid precision loss.', 'deprecated_member_use'),
+        (re.compile(r'(?<![\w.])print\('), "Don't invoke 'print' in production code. "
+         'Try using a logging framework.', 'avoid_print'),
+    ]
+    hits = []
+    for pattern, message, rule in patterns:
+        for m in pattern.finditer(text):
+            hits.append((m.start(), message, rule))
+    line = 0
+    for pos, message, rule in sorted(hits):
+        while line + 1 < len(line_starts) and line_starts[line + 1] <= pos:
+            line += 1
+        col = pos - line_starts[line] + 1
+        out.append(f'   info - {win_path}:{line + 1}:{col} - {message} - {rule}')
+    out.append(f'\n{len(hits)} issues found.')
+    return '\n'.join(out) + '\n'
+
+
+def variant_matrix():
+    """Every layout x every headline, with auto-fitted headline sizes."""
+    manifest = json.loads((TOOLS_DIR / 'assets_manifest.json').read_text(encoding='utf-8'))
+    variants = []
+    for template in manifest['variants']:
+        for k, headline in enumerate(HEADLINES):
+            variant = json.loads(json.dumps(template))
+            variant['name'] = f"{template['name']}_{k}"
+            variant.setdefault('params', {}).update(headline=headline, headline_size=None)
+            variant['outputs'] = {role: f'{k}_{name}' for role, name in template['outputs'].items()}
+            variants.append(variant)
+    return manifest, variants
+
+
+def prepare(work, sizes):
+    """Write the synthetic inputs under work/. Returns {size: dart path}."""
+    paths = {}
+    for size in sizes:
+        path = f'lib/bench_{size}.dart'
+        text = synthetic_dart(size, seed=size)
+        full = Path(work, path)
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_text(text, encoding='utf-8')
+        Path(work, f'analyze_{size}.txt').write_text(synthetic_report(text, path), encoding='utf-8')
+        paths[size] = path
+    return paths
+
+
+def run_case(case, work, size):
+    """Body of one case, run in the child. Returns (elapsed seconds, detail dict)."""
+    sys.path.insert(0, str(TOOLS_DIR))
+    os.chdir(work)
+    if case == 'assets':
+        from build_assets import render_variant
+        manifest, variants = variant_matrix()
+        out_dir = os.path.join(work, 'assets_out')
+        start = time.perf_counter()
+        for variant in variants:
+            render_variant(variant, out_dir, manifest['thumbnail_size'], manifest['preview_size'])
+        return time.perf_counter() - start, {'variants': len(variants)}
+
+    path = f'lib/bench_{size}.dart'
+    text = Path(path).read_text(encoding='utf-8')
+    if case == 'outline':
+        from dart_outline import Outline
+        start = time.perf_counter()
+        outline = Outline(text)
+        return time.perf_counter() - start, {'declarations': len(outline.declarations)}
+    if case == 'index':
+        from dart_index import index_source
+        data = text.encode('utf-8')
+        start = time.perf_counter()
+        entry = index_source(data)
+        return time.perf_counter() - start, {'declarations': len(entry['declarations'])}
+    if case == 'codemod':
+        from codemod import Codemod
+        codemod = Codemod.load(TOOLS_DIR / 'codemods' / 'context_guards.json')
+        start = time.perf_counter()
+        _, hits = codemod.apply(text)
+        return time.perf_counter() - start, {'hits': sum(hits.values())}
+    report = Path(f'analyze_{size}.txt').read_text(encoding='utf-8').splitlines()
+    if case == 'analyzer':
+        from analyzer_report import build_index
+        start = time.perf_counter()
+        index = build_index(report)
+        return time.perf_counter() - start, {'diagnostics': len(index.diagnostics)}
+    if case == 'fix':
+        from analyzer_fix import fix_file
+        from analyzer_report import parse
+        diags = list(parse(report))
+        start = time.perf_counter()
+        outcomes = fix_file(path, diags)
+        elapsed = time.perf_counter() - start
+        Path(path).write_text(text, encoding='utf-8')  # restore for the next repeat
+        return elapsed, {'fixed': sum(n for (_, outcome), n in outcomes.items() if outcome == 'fixed')}
+    raise ValueError(f'unknown case {case!r}')
+
+
+def _child(case, work, size):
+    elapsed, detail = run_case(case, work, size)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    print(json.dumps({'seconds': elapsed, 'peak_rss_kb': usage.ru_maxrss, 'detail': detail}))
+
+
+def measure(case, work, size, repeat):
+    """Fastest of repeat runs, with the highest peak RSS seen across all of them."""
+    best = None
+    peak = 0
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, __file__, '--child', case, work, str(size)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f'{case} ({size}) failed:\n{proc.stderr}')
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        peak = max(peak, result['peak_rss_kb'])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return dict(best, peak_rss_kb=peak)
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for results worse than baseline by more than tolerance."""
+    problems = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if (result['seconds'] > base['seconds'] * (1 + tolerance)
+                and result['seconds'] - base['seconds'] > NOISE_SECONDS):
+            problems.append(f"{key}: {base['seconds']:.3f}s -> {result['seconds']:.3f}s")
+        if result['peak_rss_kb'] > base['peak_rss_kb'] * (1 + tolerance):
+            problems.append(f"{key}: peak RSS {base['peak_rss_kb']} -> {result['peak_rss_kb']} KB")
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--child']:
+        _child(argv[1], argv[2], int(argv[3]))
+        return 0
+
+    parser = argparse.ArgumentParser(description='Benchmark the repo tooling on synthetic inputs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000],
+                        help='synthetic Dart file sizes in lines')
+    parser.add_argument('--cases', nargs='+', choices=ALL_CASES, default=list(ALL_CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed fractional slowdown/growth before flagging')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch directory')
+    args = parser.parse_args(argv)
+
+    work = tempfile.mkdtemp(prefix='bench-')
+    try:
+        prepare(work, args.sizes)
+        results = {}
+        for case in args.cases:
+            for size in ([0] if case == 'assets' else args.sizes):
+                key = case if case == 'assets' else f'{case}:{size}'
+                results[key] = measure(case, work, size, args.repeat)
+                if not args.json:
+                    r = results[key]
+                    detail = ', '.join(f'{k}={v}' for k, v in r['detail'].items())
+                    print(f"{key:<18} {r['seconds']:8.3f}s  {r['peak_rss_kb'] / 1024:7.1f} MB  {detail}")
+    finally:
+        if args.keep:
+            print(f'Inputs kept in {work}', file=sys.stderr)
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))['results']
+    problems = compare(results, baseline, args.tolerance)
+    if args.json:
+        print(json.dumps({'results': results, 'regressions': problems}, indent=2))
+    else:
+        for problem in problems:
+            print(f'REGRESSION {problem}')
+        if baseline and not problems:
+            print(f'No regressions against {baseline_path}')
+    if args.save_baseline:
+        from fsutil import atomic_write
+        payload = {'python': sys.version.split()[0], 'results': results}
+        atomic_write(baseline_path, json.dumps(payload, indent=2).encode('utf-8'))
+        print(f'Baseline saved to {baseline_path}', file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
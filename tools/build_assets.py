@@ -0,0 +1,193 @@
+"""
+Build the Play Store graphics described in tools/assets_manifest.json.
+
+Every variant (layout + params + input files) gets a cache key made from the
+content hashes of its inputs, the font file, the renderer source and its
+params. Only variants whose key changed, or whose outputs are missing or were
+edited by hand, are re-rendered; independent variants render in a process
+pool. A variant's thumbnail and preview are derived from the same render;
+outputs go through AssetStore, so identical bytes are never rewritten and a
+preview that equals its source image is a hard link rather than a copy.
+
+Usage:
+    python tools/build_assets.py [--manifest tools/assets_manifest.json]
+                                 [--only NAME ...] [--force] [--jobs N] [--dry-run]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from asset_store import AssetStore
+from fsutil import atomic_write, digest_bytes, digest_file
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_PATH = TOOLS_DIR / '.cache' / 'assets.json'
+DEFAULT_MANIFEST = TOOLS_DIR / 'assets_manifest.json'
+
+# layout -> module that provides its renderer
+LAYOUT_MODULES = {
+    'coin': 'generate_feature_graphic',
+    'left_brand': 'generate_feature_alternates',
+    'centered': 'generate_feature_alternates',
+    'minimal': 'generate_feature_alternates',
+    'choice': 'generate_feature_alternates',
+}
+
+
+def renderer(layout):
+    module = __import__(LAYOUT_MODULES[layout])
+    if layout == 'coin':
+        return module.render
+    return module.LAYOUTS[layout][0]
+
+
+def font_file():
+    import fonts
+    return fonts.font_path()
+
+
+def load_manifest(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def variant_key(variant, manifest, font_digest):
+    module = LAYOUT_MODULES[variant['layout']]
+    payload = {
+        'layout': variant['layout'],
+        'params': variant.get('params', {}),
+        'inputs': {k: digest_file(v) for k, v in sorted(variant.get('inputs', {}).items())},
+        'output_dir': manifest.get('output_dir'),
+        'outputs': variant['outputs'],
+        'thumbnail_size': manifest.get('thumbnail_size'),
+        'preview_size': manifest.get('preview_size'),
+        'font': font_digest,
+        'scale': variant_scale(variant, manifest),
+        'renderer': [digest_file(TOOLS_DIR / f'{name}.py') for name in (module, 'fonts', 'raster')],
+    }
+    return digest_bytes(json.dumps(payload, sort_keys=True).encode('utf-8'))
+
+
+def variant_scale(variant, manifest):
+    return variant.get('scale', manifest.get('scale', 1))
+
+
+def encode_png(img):
+    buf = io.BytesIO()
+    img.save(buf, 'PNG')
+    return buf.getvalue()
+
+
+def render_variant(variant, out_dir, thumbnail_size, preview_size, scale=1):
+    """Render one variant and its derived images. Returns {output path: bytes}.
+
+    With scale > 1 the main image is supersampled; thumbnail and preview are
+    still produced at their fixed store sizes.
+    """
+    from PIL import Image
+
+    kwargs = dict(variant.get('params', {}))
+    kwargs.update(variant.get('inputs', {}))
+    kwargs['scale'] = scale
+    img = renderer(variant['layout'])(**kwargs)
+    images = {'image': img}
+    outputs = variant['outputs']
+    if 'thumbnail' in outputs:
+        images['thumbnail'] = img.resize(tuple(thumbnail_size), Image.LANCZOS)
+    if 'preview' in outputs:
+        size = tuple(preview_size)
+        images['preview'] = img if img.size == size else img.resize(size, Image.LANCZOS)
+    encoded = {}  # a preview that needs no resize is the same image; encode it once
+    for im in images.values():
+        if id(im) not in encoded:
+            encoded[id(im)] = encode_png(im)
+    return {os.path.join(out_dir, outputs[role]): encoded[id(im)] for role, im in images.items()}
+
+
+def _build(variant, out_dir, thumbnail_size, preview_size, scale):
+    start = time.perf_counter()
+    store = AssetStore(link_duplicates=True)
+    written = {}
+    for path, data in render_variant(variant, out_dir, thumbnail_size, preview_size, scale).items():
+        digest, outcome = store.put(path, data)
+        written[Path(path).as_posix()] = [digest, outcome]
+    return variant['name'], written, time.perf_counter() - start
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def is_current(entry, key):
+    if not entry or entry.get('key') != key:
+        return False
+    for path, digest in entry.get('outputs', {}).items():
+        if not os.path.exists(path) or digest_file(path) != digest:
+            return False
+    return True
+
+
+def stale_variants(manifest, cache, only=None, force=False):
+    """Yield (variant, key) for every variant that needs rebuilding."""
+    font = font_file()
+    font_digest = digest_file(font) if font else 'default'
+    for variant in manifest['variants']:
+        if only and variant['name'] not in only:
+            continue
+        key = variant_key(variant, manifest, font_digest)
+        if force or not is_current(cache.get(variant['name']), key):
+            yield variant, key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build Play Store graphics from the asset manifest.')
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST))
+    parser.add_argument('--only', action='append', help='build only this variant (repeatable)')
+    parser.add_argument('--force', action='store_true', help='ignore the cache')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help='list stale variants and exit')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    manifest = load_manifest(args.manifest)
+    out_dir = manifest.get('output_dir', os.path.join('assets', 'playstore'))
+    thumb, preview = manifest.get('thumbnail_size', [512, 250]), manifest.get('preview_size', [1024, 500])
+    cache = load_cache()
+    stale = list(stale_variants(manifest, cache, args.only, args.force))
+
+    if args.dry_run:
+        for variant, _ in stale:
+            print('Stale', variant['name'])
+        return 0
+
+    keys = {variant['name']: key for variant, key in stale}
+    if len(stale) > 1 and (args.jobs or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(_build, v, out_dir, thumb, preview, variant_scale(v, manifest))
+                       for v, _ in stale]
+            results = [f.result() for f in futures]
+    else:
+        results = [_build(v, out_dir, thumb, preview, variant_scale(v, manifest)) for v, _ in stale]
+
+    for name, written, seconds in results:
+        cache[name] = {'key': keys[name], 'outputs': {p: d for p, (d, _) in written.items()}}
+        for path, (_, outcome) in written.items():
+            print(f'{outcome.capitalize()} {path}')
+        print(f'Built {name} in {seconds:.2f}s')
+    atomic_write(CACHE_PATH, json.dumps(cache, indent=1, sort_keys=True).encode('utf-8'))
+
+    considered = [v for v in manifest['variants'] if not args.only or v['name'] in args.only]
+    fresh = len(considered) - len(stale)
+    print(f'{len(results)} rebuilt, {fresh} up to date ({time.perf_counter() - started:.2f}s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
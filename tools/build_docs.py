@@ -0,0 +1,275 @@
+"""
+Render the docs/ legal pages from Markdown into HTML with a shared template.
+
+tools/docs_pages.json maps each Markdown source to the HTML page(s) built
+from it and names the template (docs/_template.html, filled via
+string.Template with $title, $content and $source); its paths are relative
+to the repository root, so the tool runs from any directory. A page is
+rebuilt only when the hashes of its source, the template or this builder
+differ from the ones recorded in the manifest (docs/_manifest.json), or when
+the HTML on disk no longer matches what was written. Pages and the manifest are written
+atomically, and unchanged bytes are never rewritten.
+
+--check writes nothing and exits 1 if any page is out of date. Pages the
+manifest vouches for are not re-rendered. Any other page is rendered in
+memory and compared byte for byte, so the check needs no diffing by hand.
+
+The converter is built in, so output does not depend on which Markdown
+package happens to be installed. It covers what the legal pages use:
+ATX headings (with GitHub-style ids), paragraphs, hard line breaks,
+bullet and numbered lists with continuation lines, block quotes,
+horizontal rules, **bold**, *emphasis*, `code`, [links](url) and bare
+URLs/e-mail addresses. A leading "*Last updated: ...*" line gets the
+template's last-updated style.
+
+Usage:
+    python tools/build_docs.py [--config tools/docs_pages.json] [--force]
+    python tools/build_docs.py --check
+"""
+import argparse
+import html
+import json
+import re
+import sys
+from pathlib import Path
+from string import Template
+
+from fsutil import atomic_write, digest_bytes, digest_file
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent
+DEFAULT_CONFIG = TOOLS_DIR / 'docs_pages.json'
+INDENT = '    '
+
+_HEADING = re.compile(r'^(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+_RULE = re.compile(r'^ {0,3}(?:(?:\*[ \t]*){3,}|(?:-[ \t]*){3,}|(?:_[ \t]*){3,})$')
+_ITEM = re.compile(r'^ {0,3}(?:([-*+])|(\d{1,9})[.)])[ \t]+(.*)$')
+_QUOTE = re.compile(r'^ {0,3}> ?(.*)$')
+_LAST_UPDATED = re.compile(r'^([*_])(Last updated:.*)\1$', re.I)
+
+_CODE = re.compile(r'(`+)(.+?)\1', re.S)
+_LINK = re.compile(r'\[([^\]\n]+)\]\(([^)\s]+)(?:[ \t]+"([^"]*)")?\)')
+_URL = re.compile(r'https?://[^\s<>]*[^\s<>.,:;"\')\]*_]')
+_EMAIL = re.compile(r'(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+(?<!\.)')
+_STRONG = re.compile(r'\*\*(?=\S)(.+?)(?<=\S)\*\*|__(?=\S)(.+?)(?<=\S)__(?!\w)', re.S)
+_EM = re.compile(r'(?<![\w*])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![\w*])'
+                 r'|(?<![\w_])_(?=[^\s_])(.+?)(?<=[^\s_])_(?![\w_])', re.S)
+_HARD_BREAK = re.compile(r'(?: {2,}|\\)\n')
+_SLOT = re.compile('\x00(\\d+)\x00')
+
+
+def inline(text):
+    """Markdown inline markup to HTML; everything else is escaped."""
+    slots = []
+
+    def keep(markup):
+        slots.append(markup)
+        return f'\x00{len(slots) - 1}\x00'
+
+    text = _CODE.sub(lambda m: keep(f'<code>{html.escape(m.group(2).strip())}</code>'), text)
+
+    def link(m):
+        title = f' title="{html.escape(m.group(3))}"' if m.group(3) else ''
+        return keep(f'<a href="{html.escape(m.group(2))}"{title}>{inline(m.group(1))}</a>')
+
+    text = _LINK.sub(link, text)
+    text = _URL.sub(lambda m: keep(f'<a href="{html.escape(m.group())}">{html.escape(m.group())}</a>'), text)
+    text = _EMAIL.sub(lambda m: keep(f'<a href="mailto:{m.group()}">{m.group()}</a>'), text)
+    text = html.escape(text, quote=False)
+    text = _STRONG.sub(lambda m: f'<strong>{m.group(1) or m.group(2)}</strong>', text)
+    text = _EM.sub(lambda m: f'<em>{m.group(1) or m.group(2)}</em>', text)
+    text = _HARD_BREAK.sub('<br>\n', text)
+    while _SLOT.search(text):
+        text = _SLOT.sub(lambda m: slots[int(m.group(1))], text)
+    return text
+
+
+def slugify(text, taken):
+    """GitHub-style heading id, made unique with a -1, -2... suffix."""
+    slug = re.sub(r'[^\w\- ]', '', re.sub(r'<[^>]+>', '', text).lower()).strip().replace(' ', '-')
+    candidate, n = slug, 1
+    while candidate in taken:
+        candidate, n = f'{slug}-{n}', n + 1
+    taken.add(candidate)
+    return candidate
+
+
+def blocks(lines):
+    """Group lines into (kind, payload) blocks."""
+    out = []
+    para = []
+    items = None  # (ordered, [item lines])
+
+    def flush():
+        nonlocal items
+        if para:
+            out.append(('p', '\n'.join(para)))
+            para.clear()
+        if items:
+            out.append(('ol' if items[0] else 'ul', items[1]))
+        items = None
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            flush()
+        elif _RULE.match(line):
+            flush()
+            out.append(('hr', None))
+        elif _HEADING.match(line):
+            flush()
+            m = _HEADING.match(line)
+            out.append((f'h{len(m.group(1))}', m.group(2)))
+        elif _QUOTE.match(line):
+            flush()
+            quoted = []
+            while i < len(lines) and _QUOTE.match(lines[i]):
+                quoted.append(_QUOTE.match(lines[i]).group(1))
+                i += 1
+            out.append(('blockquote', blocks(quoted)))
+            continue
+        elif _ITEM.match(line):
+            m = _ITEM.match(line)
+            ordered = m.group(2) is not None
+            if para or (items and items[0] != ordered):
+                flush()
+            if items is None:
+                items = (ordered, [])
+            items[1].append([m.group(3)])
+        elif items and (line.startswith((' ', '\t')) or not para):
+            items[1][-1].append(line.strip() + ('  ' if line.endswith('  ') else ''))
+        else:
+            para.append(line)
+        i += 1
+    flush()
+    return out
+
+
+def render_blocks(parsed, depth=1, ids=None):
+    ids = set() if ids is None else ids
+    pad = INDENT * depth
+    out = []
+    for kind, payload in parsed:
+        if kind == 'hr':
+            out.append(f'{pad}<hr>')
+        elif kind == 'blockquote':
+            inner = render_blocks(payload, depth + 1, ids)
+            out.append(f'{pad}<blockquote>\n{inner}\n{pad}</blockquote>')
+        elif kind.startswith('h'):
+            body = inline(payload)
+            out.append(f'{pad}<{kind} id="{slugify(body, ids)}">{body}</{kind}>')
+        elif kind in ('ul', 'ol'):
+            rows = '\n'.join(f'{pad}{INDENT}<li>{_indent(inline(chr(10).join(item)), pad + INDENT)}</li>'
+                             for item in payload)
+            out.append(f'{pad}<{kind}>\n{rows}\n{pad}</{kind}>')
+        else:
+            m = _LAST_UPDATED.match(payload)
+            if m:
+                out.append(f'{pad}<p class="last-updated">{inline(m.group(2))}</p>')
+            else:
+                out.append(f'{pad}<p>{_indent(inline(payload), pad)}</p>')
+    return '\n\n'.join(out)
+
+
+def _indent(text, pad):
+    return text.replace('\n', '\n' + pad)
+
+
+def markdown_to_html(text):
+    """(title, body HTML) for a Markdown document; the title is its first level-1 heading."""
+    parsed = blocks(text.splitlines())
+    title = next((payload for kind, payload in parsed if kind == 'h1'), '')
+    title = re.sub(r'<[^>]+>', '', inline(title))
+    return title, render_blocks(parsed)
+
+
+def render_page(source, template):
+    title, body = markdown_to_html(Path(source).read_text(encoding='utf-8'))
+    page = template.substitute(title=title, content=body, source=Path(source).name)
+    return page.encode('utf-8')
+
+
+def load_manifest(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def repo_path(path):
+    """Config paths are relative to the repository root, wherever the tool runs from."""
+    return REPO_ROOT / path
+
+
+def page_status(page, manifest, template_digest, builder_digest):
+    """True when the manifest vouches that the page on disk is current."""
+    entry = manifest.get('pages', {}).get(page['output'])
+    if (not entry or manifest.get('template') != template_digest
+            or manifest.get('builder') != builder_digest
+            or entry.get('source') != page['source']
+            or entry.get('source_sha256') != digest_file(repo_path(page['source']))):
+        return False
+    try:
+        return digest_file(repo_path(page['output'])) == entry.get('output_sha256')
+    except OSError:
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the docs/ HTML pages from Markdown.')
+    parser.add_argument('--config', default=str(DEFAULT_CONFIG))
+    parser.add_argument('--force', action='store_true', help='re-render every page')
+    parser.add_argument('--check', action='store_true', help='report out-of-date pages and write nothing')
+    args = parser.parse_args(argv)
+
+    config = json.loads(Path(args.config).read_text(encoding='utf-8'))
+    template_path = repo_path(config.get('template', 'docs/_template.html'))
+    manifest_path = repo_path(config.get('manifest', 'docs/_manifest.json'))
+    template_digest = digest_file(template_path)
+    builder_digest = digest_file(__file__)
+    manifest = load_manifest(manifest_path)
+    template = Template(Path(template_path).read_text(encoding='utf-8'))
+    rendered = {}  # source -> bytes; one source can feed several pages
+
+    def render(source):
+        if source not in rendered:
+            rendered[source] = render_page(repo_path(source), template)
+        return rendered[source]
+
+    stale = []
+    entries = {}
+    for page in config['pages']:
+        if not args.force and page_status(page, manifest, template_digest, builder_digest):
+            entries[page['output']] = manifest['pages'][page['output']]
+            continue
+        data = render(page['source'])
+        try:
+            current = repo_path(page['output']).read_bytes() == data
+        except OSError:
+            current = False
+        if not current:
+            stale.append(page['output'])
+            if not args.check:
+                atomic_write(repo_path(page['output']), data)
+                print(f"Wrote {page['output']} from {page['source']}")
+        entries[page['output']] = {'source': page['source'],
+                                   'source_sha256': digest_file(repo_path(page['source'])),
+                                   'output_sha256': digest_bytes(data)}
+
+    if args.check:
+        for path in stale:
+            print(f'Out of date: {path} (run python tools/build_docs.py)')
+        print(f'{len(config["pages"]) - len(stale)} current, {len(stale)} out of date')
+        return 1 if stale else 0
+
+    new_manifest = {'builder': builder_digest, 'template': template_digest,
+                    'pages': dict(sorted(entries.items()))}
+    if new_manifest != manifest:
+        atomic_write(manifest_path, (json.dumps(new_manifest, indent=2) + '\n').encode('utf-8'))
+    print(f'{len(stale)} rebuilt, {len(config["pages"]) - len(stale)} up to date')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Compose framed, captioned Play Store screenshots from raw app captures.
+
+tools/screenshots_manifest.json lists the screens (raw file + caption per
+locale), the locales and the output targets (phone and tablet sizes). Raw
+captures are read from <source_dir>/<locale>/<file>; a locale without its own
+capture of a screen reuses the default locale's, so only the caption needs
+translating. Each output is a gradient background, the caption word-wrapped
+and auto-sized into the top band, and the capture inside a procedural device
+frame that bleeds off the bottom edge. Outputs go to
+<output_dir>/<locale>/<target>/<name>.png.
+
+Work is split per (locale, screen): one job decodes its capture once and
+renders every target from it, and jobs run in a process pool. Each worker
+memoizes the per-target backdrop (gradient, accent bar, device body), the
+screen mask and the fonts, so those are built once per target size rather
+than once per image. As in build_assets.py, a job's cache key covers the
+capture's content hash, caption, targets, style, font and the renderer
+sources; unchanged jobs are skipped and outputs are written via AssetStore.
+
+Usage:
+    python tools/build_screenshots.py [--manifest tools/screenshots_manifest.json]
+                                      [--locale en-US ...] [--only 01_dashboard ...]
+                                      [--source-dir DIR] [--force] [--jobs N] [--dry-run]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from asset_store import AssetStore
+from build_assets import encode_png, font_file, is_current, load_cache
+from fsutil import atomic_write, digest_bytes, digest_file
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_PATH = TOOLS_DIR / '.cache' / 'screenshots.json'
+DEFAULT_MANIFEST = TOOLS_DIR / 'screenshots_manifest.json'
+RENDERER_SOURCES = ('build_screenshots', 'raster', 'fonts')
+
+# Layout in units of 1/1080 of the output width.
+BASE_WIDTH = 1080
+CAPTION_TOP, CAPTION_HEIGHT, CAPTION_SIDE = 90, 300, 80
+DEVICE_TOP, DEVICE_WIDTH, DEVICE_ASPECT = 450, 800, 2.05
+BEZEL, BODY_RADIUS, SCREEN_RADIUS, CAMERA = 22, 96, 74, 26
+
+
+def load_manifest(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def raw_path(manifest, source_dir, locale, screen):
+    """The capture for locale, falling back to the default locale's."""
+    for loc in (locale, manifest.get('default_locale')):
+        if loc:
+            path = os.path.join(source_dir, loc, screen['file'])
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def caption_for(manifest, locale, screen):
+    captions = screen.get('caption', {})
+    return captions.get(locale) or captions.get(manifest.get('default_locale'), '')
+
+
+def wrap(text, size, max_width):
+    """Greedy word wrap of text at font size so every line fits max_width."""
+    import fonts
+
+    lines = []
+    for word in text.split():
+        if lines and fonts.text_size(f'{lines[-1]} {word}', size)[0] <= max_width:
+            lines[-1] = f'{lines[-1]} {word}'
+        else:
+            lines.append(word)
+    return '\n'.join(lines)
+
+
+def fit_caption(text, max_width, max_height, hi, lo=12):
+    """Largest size (and its wrapping) at which text fits the box."""
+    import fonts
+
+    best = (wrap(text, lo, max_width), lo)
+    if fonts.font_path() is None:
+        return best  # the bitmap default font does not scale
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        wrapped = wrap(text, mid, max_width)
+        w, h = fonts.text_size(wrapped, mid)
+        if w <= max_width and h <= max_height:
+            best = (wrapped, mid)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+def _rounded_mask(width, height, radius):
+    """Anti-aliased rounded-rectangle coverage, computed analytically (no supersampling)."""
+    import numpy as np
+    from PIL import Image
+
+    xs = np.arange(width) + 0.5
+    ys = np.arange(height) + 0.5
+    # Distance past the corner circles' centres; zero along the straight edges.
+    dx = np.maximum(np.maximum(radius - xs, xs - (width - radius)), 0)
+    dy = np.maximum(np.maximum(radius - ys, ys - (height - radius)), 0)
+    dist = np.sqrt(dx[None, :] ** 2 + dy[:, None] ** 2)
+    coverage = np.clip(radius - dist + 0.5, 0.0, 1.0)
+    return Image.fromarray(np.rint(coverage * 255).astype(np.uint8), 'L')
+
+
+@lru_cache(maxsize=16)
+def device_frame(width, frame_color):
+    """(device body RGBA, screen box, screen mask) for an output width, built once per worker."""
+    from PIL import Image, ImageChops
+
+    u = width / BASE_WIDTH
+    body_w = round(DEVICE_WIDTH * u)
+    body_h = round(DEVICE_WIDTH * DEVICE_ASPECT * u)
+    bezel = round(BEZEL * u)
+    body = Image.new('RGBA', (body_w, body_h), tuple(frame_color) + (255,))
+    body.putalpha(_rounded_mask(body_w, body_h, round(BODY_RADIUS * u)))
+    screen_box = (bezel, bezel, body_w - bezel, body_h - bezel)
+    screen_size = (screen_box[2] - screen_box[0], screen_box[3] - screen_box[1])
+    screen_mask = _rounded_mask(*screen_size, round(SCREEN_RADIUS * u))
+    # Punch-hole camera, cut out of the mask so the frame colour shows through.
+    cam = round(CAMERA * u)
+    at = (screen_size[0] // 2 - cam // 2, round(28 * u))
+    region = at + (at[0] + cam, at[1] + cam)
+    hole = ImageChops.invert(_rounded_mask(cam, cam, cam / 2))
+    screen_mask.paste(ImageChops.multiply(screen_mask.crop(region), hole), region)
+    return body, screen_box, screen_mask
+
+
+@lru_cache(maxsize=16)
+def backdrop(size, style_json):
+    """Background, accent bar and device body for a target; shared by every screen of that size."""
+    from raster import Canvas
+
+    style = json.loads(style_json)
+    width, height = size
+    u = width / BASE_WIDTH
+    canvas = Canvas(width, height, style['background'])
+    canvas.vertical_gradient(style['background'], style.get('darken', 0.35))
+    accent_y = round((CAPTION_TOP - 34) * u)
+    canvas.rect(width // 2 - round(60 * u), accent_y, width // 2 + round(60 * u),
+                accent_y + max(round(6 * u), 1), style['accent'])
+    img = canvas.to_image()
+    body, _, _ = device_frame(width, tuple(style['frame']))
+    img.paste(body, ((width - body.width) // 2, round(DEVICE_TOP * u)), body)
+    return img
+
+
+def compose(capture, caption, size, style):
+    """One framed, captioned screenshot of the given size from a decoded RGB capture."""
+    from PIL import Image, ImageDraw, ImageOps
+
+    import fonts
+
+    width, height = size
+    u = width / BASE_WIDTH
+    img = backdrop(tuple(size), json.dumps(style, sort_keys=True)).copy()
+    body, screen_box, screen_mask = device_frame(width, tuple(style['frame']))
+    left, top = (width - body.width) // 2, round(DEVICE_TOP * u)
+    # Cover the screen, anchored at the top so the status bar and header stay visible.
+    screen = ImageOps.fit(capture, screen_mask.size, Image.LANCZOS, centering=(0.5, 0.0))
+    img.paste(screen, (left + screen_box[0], top + screen_box[1]), screen_mask)
+
+    box_w, box_h = width - 2 * round(CAPTION_SIDE * u), round(CAPTION_HEIGHT * u)
+    text, text_px = fit_caption(caption, box_w, box_h, round(style.get('max_caption_size', 72) * u))
+    x0, y0, x1, y1 = fonts.text_bbox(text, text_px)
+    x = (width - (x1 - x0)) / 2 - x0
+    y = round(CAPTION_TOP * u) + (box_h - (y1 - y0)) / 2 - y0
+    ImageDraw.Draw(img).multiline_text((x, y), text, font=fonts.font(text_px),
+                                       fill=tuple(style['caption']), align='center')
+    return img
+
+
+def render_screen(job):
+    """Render every target of one (locale, screen) job. Returns {output path: bytes}."""
+    from PIL import Image
+
+    with Image.open(job['raw']) as im:
+        capture = im.convert('RGB')
+    return {os.path.join(job['out_dir'], target, f"{job['name']}.png"):
+            encode_png(compose(capture, job['caption'], size, job['style']))
+            for target, size in job['targets'].items()}
+
+
+def _build(job):
+    start = time.perf_counter()
+    store = AssetStore()
+    written = {}
+    for path, data in render_screen(job).items():
+        digest, outcome = store.put(path, data)
+        written[Path(path).as_posix()] = [digest, outcome]
+    return job['id'], written, time.perf_counter() - start
+
+
+def plan(manifest, source_dir, locales=None, only=None):
+    """(jobs, missing) for the requested locales and screens."""
+    jobs, missing = [], []
+    for locale in locales or manifest['locales']:
+        for screen in manifest['screens']:
+            if only and screen['name'] not in only:
+                continue
+            raw = raw_path(manifest, source_dir, locale, screen)
+            if raw is None:
+                missing.append(os.path.join(source_dir, locale, screen['file']))
+                continue
+            jobs.append({
+                'id': f"{locale}/{screen['name']}",
+                'name': screen['name'],
+                'raw': raw,
+                'caption': caption_for(manifest, locale, screen),
+                'targets': manifest['targets'],
+                'style': manifest.get('style', {}),
+                'out_dir': os.path.join(manifest.get('output_dir', 'assets/screenshots'), locale),
+            })
+    return jobs, missing
+
+
+def job_key(job, font_digest, renderer_digest):
+    payload = {k: job[k] for k in ('caption', 'targets', 'style', 'out_dir', 'name')}
+    payload.update(raw=digest_file(job['raw']), font=font_digest, renderer=renderer_digest)
+    return digest_bytes(json.dumps(payload, sort_keys=True).encode('utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compose framed, captioned store screenshots.')
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST))
+    parser.add_argument('--locale', action='append', help='build only this locale (repeatable)')
+    parser.add_argument('--only', action='append', help='build only this screen (repeatable)')
+    parser.add_argument('--source-dir', help="raw captures root (default: the manifest's source_dir)")
+    parser.add_argument('--force', action='store_true', help='ignore the cache')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help='list stale screens and exit')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    manifest = load_manifest(args.manifest)
+    source_dir = args.source_dir or manifest.get('source_dir', 'screenshots')
+    jobs, missing = plan(manifest, source_dir, args.locale, args.only)
+    for path in missing:
+        print(f'Missing capture {path}', file=sys.stderr)
+
+    font = font_file()
+    font_digest = digest_file(font) if font else 'default'
+    renderer_digest = [digest_file(TOOLS_DIR / f'{name}.py') for name in RENDERER_SOURCES]
+    cache = load_cache(CACHE_PATH)
+    keys = {job['id']: job_key(job, font_digest, renderer_digest) for job in jobs}
+    stale = [job for job in jobs if args.force or not is_current(cache.get(job['id']), keys[job['id']])]
+
+    if args.dry_run:
+        for job in stale:
+            print('Stale', job['id'])
+        return 1 if missing else 0
+
+    if len(stale) > 1 and (args.jobs or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(_build, stale))
+    else:
+        results = [_build(job) for job in stale]
+
+    for job_id, written, seconds in results:
+        cache[job_id] = {'key': keys[job_id], 'outputs': {p: d for p, (d, _) in written.items()}}
+        for path, (_, outcome) in written.items():
+            if outcome != 'unchanged':
+                print(f'{outcome.capitalize()} {path}')
+        print(f'Built {job_id} in {seconds:.2f}s')
+    if results:
+        atomic_write(CACHE_PATH, json.dumps(cache, indent=1, sort_keys=True).encode('utf-8'))
+
+    fresh = len(jobs) - len(stale)
+    outputs = len(results) * len(manifest['targets'])
+    print(f'{len(results)} screen(s) rebuilt ({outputs} images), {fresh} up to date, '
+          f'{len(missing)} missing ({time.perf_counter() - started:.2f}s)')
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
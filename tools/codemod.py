@@ -0,0 +1,234 @@
+"""
+Declarative codemod engine for the Dart sources.
+
+Rules live in a JSON file and are either literal or regex rewrites:
+
+    {
+      "rules": [
+        {"name": "debug-print", "literal": "print('x');", "replace": "debugPrint('x');"},
+        {"name": "opacity", "regex": "\\.withOpacity\\((?P<a>[\\d.]+)\\)",
+         "replace": ".withValues(alpha: \\g<a>)"}
+      ]
+    }
+
+Every rule is compiled into one combined alternation, so each file is scanned
+once no matter how many rules there are. Where two rules match at the same
+position the one listed first wins. Optional rule keys:
+    max      - stop rewriting after this many hits per file (like str.replace(..., n))
+    flags    - any of "imsx" for regex rules
+    unless   - skip the rule for files that already contain this text
+    optional - true if the rule may legitimately match nothing (see --strict)
+Rules that share a name are alternatives for one rewrite (say, the same
+block before and after another rule touched it): hits and max are counted
+per name.
+
+Output whose `{}` nesting (outside strings and comments) differs from the
+input is never written: a rule that opens or closes a block it does not
+also close or open is reported instead.
+
+Usage:
+    python tools/codemod.py <rules.json> <file.dart> [...] [--dry-run] [--strict]
+"""
+from collections import Counter
+import argparse
+import difflib
+import json
+import re
+import sys
+from pathlib import Path
+
+from dart_outline import mask
+
+_NAMED_GROUP = re.compile(r'\(\?P<(\w+)>')
+_NAMED_BACKREF = re.compile(r'\(\?P=(\w+)\)')
+_NUMBERED_BACKREF = re.compile(r'(?<!\\)\\[1-9]')
+_BRACE = re.compile(r'[{}]')
+
+
+class Rule:
+    def __init__(self, name, pattern, replace, literal=False, max_hits=None, unless=None,
+                 optional=False):
+        self.name = name
+        self.pattern = pattern
+        self.replace = replace
+        self.literal = literal
+        self.max_hits = max_hits
+        self.unless = unless
+        self.optional = optional
+
+    @classmethod
+    def from_dict(cls, data, index):
+        name = data.get('name') or f'rule{index}'
+        if ('literal' in data) == ('regex' in data):
+            raise ValueError(f"rule '{name}' needs exactly one of 'literal' or 'regex'")
+        if 'replace' not in data:
+            raise ValueError(f"rule '{name}' is missing 'replace'")
+        extra = {'max_hits': data.get('max'), 'unless': data.get('unless'),
+                 'optional': bool(data.get('optional'))}
+        if 'literal' in data:
+            pattern = re.compile(re.escape(data['literal']))
+            return cls(name, pattern, data['replace'], True, **extra)
+        source = data['regex']
+        if _NUMBERED_BACKREF.search(source):
+            raise ValueError(f"rule '{name}': use named backreferences (?P=name) in patterns")
+        flags = 0
+        for flag in data.get('flags', ''):
+            flags |= {'i': re.I, 'm': re.M, 's': re.S, 'x': re.X}[flag]
+        return cls(name, re.compile(source, flags), data['replace'], False, **extra)
+
+    def combined_source(self, index):
+        """Pattern source for the shared alternation, with group names made unique."""
+        source = self.pattern.pattern
+        if not self.literal:
+            source = _NAMED_GROUP.sub(lambda m: f'(?P<_r{index}_{m.group(1)}>', source)
+            source = _NAMED_BACKREF.sub(lambda m: f'(?P=_r{index}_{m.group(1)})', source)
+        flags = ''.join(c for c, f in (('i', re.I), ('m', re.M), ('s', re.S), ('x', re.X))
+                        if self.pattern.flags & f)
+        if flags:
+            source = f'(?{flags}:{source})'
+        return f'(?P<_r{index}>{source})'
+
+
+class Codemod:
+    def __init__(self, rules):
+        if not rules:
+            raise ValueError('no rules given')
+        self.rules = rules
+        self._matchers = {}
+        self.matcher, self._rule_for_group = self._matcher(frozenset(range(len(rules))))
+
+    def _matcher(self, active):
+        """Combined alternation over the rules with the given indices, cached per set."""
+        if active not in self._matchers:
+            indices = sorted(active)
+            matcher = re.compile('|'.join(self.rules[i].combined_source(i) for i in indices))
+            # The wrapping group closes last, so lastindex always points at it.
+            groups = {matcher.groupindex[f'_r{i}']: self.rules[i] for i in indices}
+            self._matchers[active] = (matcher, groups)
+        return self._matchers[active]
+
+    @classmethod
+    def load(cls, rules_path, names=None):
+        """Rules from a JSON file; with names, only the rules whose name is listed."""
+        data = json.loads(Path(rules_path).read_text(encoding='utf-8'))
+        entries = data['rules'] if isinstance(data, dict) else data
+        rules = [Rule.from_dict(d, i) for i, d in enumerate(entries)]
+        if names is not None:
+            rules = [r for r in rules if r.name in names]
+        return cls(rules)
+
+    def apply(self, text):
+        """Rewrite text in one pass. Returns (new_text, Counter of hits per rule name).
+
+        A rule that reaches its max drops out of the alternation, and scanning
+        resumes where its last hit ended, so text it would have claimed is
+        still offered to the remaining rules.
+        """
+        hits = Counter()
+        out = []
+        last = 0
+        active = frozenset(i for i, r in enumerate(self.rules)
+                           if (r.max_hits is None or r.max_hits > 0)
+                           and not (r.unless and r.unless in text))
+        while active:
+            matcher, rule_for_group = self._matcher(active)
+            capped = None
+            for m in matcher.finditer(text, last):
+                rule = rule_for_group[m.lastindex]
+                if rule.literal:
+                    replacement = rule.replace
+                else:
+                    # Re-match with the rule's own pattern so its group numbers apply.
+                    replacement = rule.pattern.match(text, m.start()).expand(rule.replace)
+                out.append(text[last:m.start()])
+                out.append(replacement)
+                last = m.end()
+                hits[rule.name] += 1
+                if rule.max_hits is not None and hits[rule.name] >= rule.max_hits:
+                    capped = rule
+                    break
+            if capped is None:
+                break
+            active = frozenset(i for i in active if self.rules[i].name != capped.name)
+        if not hits:
+            return text, hits
+        out.append(text[last:])
+        return ''.join(out), hits
+
+
+def missing_rules(codemod, hits):
+    """Names of the non-optional rules with no hits."""
+    return list(dict.fromkeys(r.name for r in codemod.rules if not r.optional and not hits[r.name]))
+
+
+def brace_profile(text):
+    """(net depth, lowest depth) of the `{}` outside strings and comments."""
+    depth = lowest = 0
+    for m in _BRACE.finditer(mask(text)):
+        depth += 1 if m.group() == '{' else -1
+        lowest = min(lowest, depth)
+    return depth, lowest
+
+
+def same_nesting(before, after):
+    return brace_profile(before) == brace_profile(after)
+
+
+def read_source(path):
+    """Read a source file with CRLF normalized. Returns (text, newline)."""
+    raw = Path(path).read_bytes().decode('utf-8')
+    newline = '\r\n' if '\r\n' in raw else '\n'
+    return raw.replace('\r\n', '\n'), newline
+
+
+def encode_source(text, newline):
+    if newline != '\n':
+        text = text.replace('\n', newline)
+    return text.encode('utf-8')
+
+
+def unified_diff(path, before, after):
+    return ''.join(difflib.unified_diff(
+        before.splitlines(keepends=True), after.splitlines(keepends=True),
+        fromfile=f'a/{path}', tofile=f'b/{path}'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply a codemod rule file to Dart sources.')
+    parser.add_argument('rules', help='JSON rule file')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--dry-run', action='store_true', help='print a diff instead of writing')
+    parser.add_argument('--strict', action='store_true', help='exit 1 if a non-optional rule never matched')
+    args = parser.parse_args(argv)
+
+    codemod = Codemod.load(args.rules)
+    totals = Counter()
+    refused = []
+    for name in args.files:
+        text, newline = read_source(name)
+        new_text, hits = codemod.apply(text)
+        totals.update(hits)
+        if not hits:
+            continue
+        if not same_nesting(text, new_text):
+            refused.append(name)
+            print(f"{name}: not written, the rewrite changes the {{}} nesting", file=sys.stderr)
+            continue
+        if args.dry_run:
+            sys.stdout.write(unified_diff(name, text, new_text))
+        else:
+            Path(name).write_bytes(encode_source(new_text, newline))
+        print(f"{name}: {sum(hits.values())} replacement(s)", file=sys.stderr)
+
+    names = list(dict.fromkeys(r.name for r in codemod.rules))
+    missed = missing_rules(codemod, totals)
+    for name in names:
+        print(f"  {name}: {totals[name]}", file=sys.stderr)
+    if missed and args.strict:
+        print(f"Rules with no matches: {', '.join(missed)}", file=sys.stderr)
+        return 1
+    return 1 if refused else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Run a codemod rule file over every Dart file under lib/ in parallel.
+
+Files are fanned out to a process pool; each worker compiles the rules once and
+rewrites its files in a single pass (see codemod.py). Results are written
+atomically and only when the content changed; a rewrite that changes a
+file's `{}` nesting is refused and reported, and the exit status is 1. An mtime+hash cache in
+tools/.cache/ lets re-runs skip files that are known to be unaffected by the
+current rule set without reading them.
+
+Usage:
+    python tools/codemod_runner.py <rules.json> [--root lib] [--glob '**/*.dart']
+                                   [--jobs N] [--dry-run] [--no-cache]
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from codemod import Codemod, read_source, encode_source, same_nesting, unified_diff
+from fsutil import atomic_write, digest_bytes
+
+CACHE_PATH = Path(__file__).resolve().parent / '.cache' / 'codemod_runner.json'
+
+_codemod = None
+
+
+def _init_worker(rules_path):
+    global _codemod
+    _codemod = Codemod.load(rules_path)
+
+
+def _process(path, dry_run, known_digest):
+    start = time.perf_counter()
+    raw = Path(path).read_bytes()
+    digest = digest_bytes(raw)
+    result = {'path': path, 'hits': {}, 'changed': False, 'diff': None, 'refused': False}
+    if digest != known_digest:
+        text, newline = read_source(path)
+        new_text, hits = _codemod.apply(text)
+        result['hits'] = dict(hits)
+        if new_text != text and not same_nesting(text, new_text):
+            result['refused'] = True
+        elif new_text != text:
+            result['changed'] = True
+            data = encode_source(new_text, newline)
+            if dry_run:
+                result['diff'] = unified_diff(path, text, new_text)
+            else:
+                atomic_write(path, data)
+                digest = digest_bytes(data)
+    if not (dry_run and result['changed']) and not result['refused']:
+        st = os.stat(path)
+        result['stamp'] = [st.st_mtime_ns, st.st_size, digest]
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def load_cache(rules_digest):
+    try:
+        data = json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if data.get('rules') != rules_digest:
+        return {}
+    return data.get('files', {})
+
+
+def save_cache(rules_digest, files):
+    payload = json.dumps({'rules': rules_digest, 'files': files}, indent=0, sort_keys=True)
+    atomic_write(CACHE_PATH, payload.encode('utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply a codemod rule file across lib/.')
+    parser.add_argument('rules', help='JSON rule file')
+    parser.add_argument('--root', default='lib')
+    parser.add_argument('--glob', default='**/*.dart')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: cpu count)')
+    parser.add_argument('--dry-run', action='store_true', help='print diffs instead of writing')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and do not update the cache')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    Codemod.load(args.rules)  # fail fast on a bad rule file before spawning workers
+    rules_digest = digest_bytes(Path(args.rules).read_bytes())
+    cache = {} if args.no_cache else load_cache(rules_digest)
+
+    files = sorted(p.as_posix() for p in Path(args.root).glob(args.glob) if p.is_file())
+    todo = []
+    skipped = 0
+    for path in files:
+        st = os.stat(path)
+        stamp = cache.get(path)
+        if stamp and stamp[0] == st.st_mtime_ns and stamp[1] == st.st_size:
+            skipped += 1
+            continue
+        # mtime moved but the content may not have; the worker checks the hash.
+        todo.append((path, stamp[2] if stamp else None))
+
+    results = []
+    if todo:
+        jobs = args.jobs or os.cpu_count() or 1
+        if jobs == 1 or len(todo) == 1:
+            _init_worker(args.rules)
+            results = [_process(path, args.dry_run, known) for path, known in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                     initargs=(args.rules,)) as pool:
+                futures = [pool.submit(_process, path, args.dry_run, known) for path, known in todo]
+                results = [f.result() for f in futures]
+
+    totals = Counter()
+    touched = []
+    refused = []
+    for result in results:
+        if result['refused']:
+            refused.append(result['path'])
+        else:
+            totals.update(result['hits'])
+        if result['changed']:
+            touched.append(result)
+            if result['diff']:
+                sys.stdout.write(result['diff'])
+        if 'stamp' in result:
+            cache[result['path']] = result['stamp']
+        else:
+            cache.pop(result['path'], None)
+
+    if not args.no_cache:
+        live = set(files)
+        save_cache(rules_digest, {k: v for k, v in cache.items() if k in live})
+
+    verb = 'would change' if args.dry_run else 'changed'
+    print(f"{len(files)} files: {len(touched)} {verb}, {len(results)} scanned, "
+          f"{skipped} skipped (cached)", file=sys.stderr)
+    for result in touched:
+        print(f"  {result['path']}: {sum(result['hits'].values())} hit(s) "
+              f"in {result['seconds'] * 1000:.1f} ms", file=sys.stderr)
+    for path in refused:
+        print(f"  {path}: not written, the rewrite changes the {{}} nesting", file=sys.stderr)
+    for name, count in sorted(totals.items()):
+        print(f"  rule {name}: {count}", file=sys.stderr)
+    slowest = sorted(results, key=lambda r: r['seconds'], reverse=True)[:5]
+    for result in slowest:
+        print(f"  {result['seconds'] * 1000:7.1f} ms  {result['path']}", file=sys.stderr)
+    print(f"Done in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    return 1 if refused else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
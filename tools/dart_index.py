@@ -0,0 +1,255 @@
+"""
+Persistent symbol index for the Dart sources under lib/.
+
+Every file is outlined once (see dart_outline.py) into its classes, members
+and top-level declarations with line and byte ranges, plus the call sites of
+every name. The index lives in tools/.cache/dart_index.json and is refreshed
+incrementally: files are re-parsed only when their content hash changes.
+Line/text queries read the file through mmap using the stored line-offset
+table instead of loading and splitting it.
+
+Usage:
+    python tools/dart_index.py build
+    python tools/dart_index.py def NAME            # where is NAME declared
+    python tools/dart_index.py count NAME          # declarations and call sites
+    python tools/dart_index.py calls NAME
+    python tools/dart_index.py outline FILE
+    python tools/dart_index.py lines FILE N [M]    # print lines N..M (or N only)
+    python tools/dart_index.py find TEXT [--regex] [--file FILE]
+"""
+from bisect import bisect_right
+from collections import defaultdict
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from pathlib import Path
+
+from dart_outline import Outline
+from fsutil import atomic_write, digest_bytes
+
+INDEX_PATH = Path(__file__).resolve().parent / '.cache' / 'dart_index.json'
+INDEX_VERSION = 1
+
+_CALL = re.compile(r'(?<![\w$.])([A-Za-z_$][\w$]*)\s*(?:<[^;{}()]*>)?\s*\(|\.([A-Za-z_$][\w$]*)\s*(?:<[^;{}()]*>)?\s*\(')
+_NOT_CALLS = frozenset({
+    'if', 'for', 'while', 'switch', 'catch', 'return', 'assert', 'super', 'this',
+    'await', 'throw', 'new', 'const', 'final', 'var', 'in', 'is', 'as', 'sizeOf',
+})
+
+
+def _line_offsets(data):
+    """Byte offset of the start of each line."""
+    offsets = [0]
+    find = data.find
+    pos = find(b'\n')
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = find(b'\n', pos + 1)
+    return offsets
+
+
+def index_source(data):
+    """Index one file's bytes. Returns the JSON-able entry (without stamps)."""
+    text = data.decode('utf-8').replace('\r\n', '\n')
+    outline = Outline(text)
+    lines = _line_offsets(data)
+    body_lines = text.split('\n')
+
+    def byte_pos(line, col_offset):
+        # Columns are characters; convert the line prefix to UTF-8 bytes.
+        prefix = body_lines[line - 1][:col_offset]
+        return lines[line - 1] + len(prefix.encode('utf-8'))
+
+    declarations = []
+    for d in outline.declarations:
+        start_col = d.start - outline.line_starts[d.start_line - 1]
+        end_col = d.end - outline.line_starts[d.end_line - 1]
+        declarations.append({
+            'name': d.name,
+            'kind': d.kind,
+            'parent': d.parent.name if d.parent else None,
+            'lines': [d.start_line, d.end_line],
+            'bytes': [byte_pos(d.start_line, start_col), byte_pos(d.end_line, end_col)],
+            'signature': d.signature,
+        })
+
+    calls = defaultdict(list)
+    for m in _CALL.finditer(outline.masked):
+        name = m.group(1) or m.group(2)
+        if name in _NOT_CALLS:
+            continue
+        line = outline.line_of(m.start())
+        calls[name].append(line)
+    # A declaration's own header looks like a call (`void _foo(`); drop it.
+    for d in outline.declarations:
+        sites = calls.get(d.name)
+        if sites and d.start_line in sites and d.kind in ('method', 'function', 'constructor'):
+            sites.remove(d.start_line)
+            if not sites:
+                del calls[d.name]
+    return {'line_offsets': lines, 'declarations': declarations, 'calls': dict(calls)}
+
+
+class DartIndex:
+    def __init__(self, root='lib', path=INDEX_PATH):
+        self.root = root
+        self.path = Path(path)
+        self.files = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == INDEX_VERSION and data.get('root') == root:
+                self.files = data['files']
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        if self.dirty:
+            payload = {'version': INDEX_VERSION, 'root': self.root, 'files': self.files}
+            atomic_write(self.path, json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+            self.dirty = False
+
+    def refresh_file(self, path):
+        """Bring one file's entry up to date. Returns 'unchanged', 'touched' or 'indexed'."""
+        st = os.stat(path)
+        entry = self.files.get(path)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return 'unchanged'
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = digest_bytes(data)
+        self.dirty = True
+        if entry and entry['digest'] == digest:
+            entry['mtime_ns'], entry['size'] = st.st_mtime_ns, st.st_size
+            return 'touched'
+        entry = index_source(data)
+        entry.update(digest=digest, mtime_ns=st.st_mtime_ns, size=st.st_size)
+        self.files[path] = entry
+        return 'indexed'
+
+    def refresh(self):
+        """Re-index changed files and drop deleted ones. Returns {outcome: count}."""
+        counts = defaultdict(int)
+        present = {p.as_posix() for p in Path(self.root).rglob('*.dart')}
+        for path in sorted(present):
+            counts[self.refresh_file(path)] += 1
+        for path in set(self.files) - present:
+            del self.files[path]
+            self.dirty = True
+            counts['removed'] += 1
+        return dict(counts)
+
+    def definitions(self, name):
+        for path, entry in sorted(self.files.items()):
+            for d in entry['declarations']:
+                qualified = f"{d['parent']}.{d['name']}" if d['parent'] else d['name']
+                if name in (d['name'], qualified):
+                    yield path, d
+
+    def call_sites(self, name):
+        for path, entry in sorted(self.files.items()):
+            for line in entry['calls'].get(name, ()):
+                yield path, line
+
+    def read_lines(self, path, first, last=None):
+        """Yield (line number, text) for lines first..last using mmap and the offset table."""
+        self.refresh_file(path)
+        offsets = self.files[path]['line_offsets']
+        last = min(last or first, len(offsets))
+        if os.path.getsize(path) == 0 or first > last:
+            return
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for n in range(first, last + 1):
+                start = offsets[n - 1]
+                end = offsets[n] if n < len(offsets) else len(mm)
+                yield n, mm[start:end].decode('utf-8').rstrip('\r\n')
+
+    def find(self, needle, regex=False, paths=None):
+        """Yield (path, line, line text) for every occurrence of needle (bytes search via mmap)."""
+        pattern = re.compile(needle.encode('utf-8') if regex else re.escape(needle.encode('utf-8')),
+                             re.M)
+        for path in paths or sorted(self.files):
+            self.refresh_file(path)
+            offsets = self.files[path]['line_offsets']
+            if os.path.getsize(path) == 0:
+                continue
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for m in pattern.finditer(mm):
+                    line = bisect_right(offsets, m.start())
+                    end = offsets[line] if line < len(offsets) else len(mm)
+                    yield path, line, mm[offsets[line - 1]:end].decode('utf-8').rstrip('\r\n')
+
+
+def _print_def(path, d):
+    qualified = f"{d['parent']}.{d['name']}" if d['parent'] else d['name']
+    print(f"{path}:{d['lines'][0]}-{d['lines'][1]}  {d['kind']:<11} {qualified}  {d['signature']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the persistent Dart symbol index.')
+    parser.add_argument('--root', default='lib')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build')
+    for name in ('def', 'count', 'calls'):
+        sub.add_parser(name).add_argument('name')
+    sub.add_parser('outline').add_argument('file')
+    p = sub.add_parser('lines')
+    p.add_argument('file')
+    p.add_argument('first', type=int)
+    p.add_argument('last', type=int, nargs='?')
+    p = sub.add_parser('find')
+    p.add_argument('text')
+    p.add_argument('--regex', action='store_true')
+    p.add_argument('--file', action='append')
+    args = parser.parse_args(argv)
+
+    index = DartIndex(args.root)
+    files = [args.file] if args.command in ('lines', 'outline') else getattr(args, 'file', None) or []
+    for path in files:
+        if not os.path.isfile(path):
+            print(f'No such file: {path}', file=sys.stderr)
+            return 2
+    if args.command == 'lines':
+        for n, text in index.read_lines(Path(args.file).as_posix(), args.first, args.last):
+            print(f'{n}: {text}')
+        index.save()
+        return 0
+
+    counts = index.refresh()
+    status = 0
+    if args.command == 'build':
+        print(', '.join(f'{n} {k}' for k, n in sorted(counts.items())),
+              f'({len(index.files)} files, '
+              f"{sum(len(e['declarations']) for e in index.files.values())} declarations)")
+    elif args.command == 'def':
+        found = list(index.definitions(args.name))
+        for path, d in found:
+            _print_def(path, d)
+        status = 0 if found else 1
+    elif args.command == 'count':
+        defs = list(index.definitions(args.name))
+        calls = list(index.call_sites(args.name))
+        print(f'{args.name}: {len(defs)} declaration(s), {len(calls)} call site(s)')
+    elif args.command == 'calls':
+        for path, line in index.call_sites(args.name):
+            print(f'{path}:{line}')
+    elif args.command == 'outline':
+        path = Path(args.file).as_posix()
+        for d in index.files.get(path, {}).get('declarations', ()):
+            _print_def(path, d)
+    elif args.command == 'find':
+        paths = [Path(f).as_posix() for f in args.file] if args.file else None
+        hits = 0
+        for path, line, text in index.find(args.text, args.regex, paths):
+            print(f'{path}:{line}: {text}')
+            hits += 1
+        print(f'{hits} match(es)', file=sys.stderr)
+    index.save()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
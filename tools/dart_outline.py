@@ -0,0 +1,429 @@
+"""
+Lightweight outline of a Dart source file.
+
+This is not a Dart parser. It masks comments and string literals (keeping the
+code inside interpolations), then walks the bracket structure to find
+top-level declarations and the members of classes, mixins, extensions and
+enums, with their offsets and line ranges. That is enough to anchor analyzer
+diagnostics to the enclosing method, index symbols and cut whole members out
+of a file.
+"""
+from bisect import bisect_right
+import re
+
+_CODE_EVENT = re.compile(r"//|/\*|['\"{}]")
+_BLOCK_COMMENT_EVENT = re.compile(r'/\*|\*/')
+_IDENT_START = re.compile(r'[A-Za-z_]')
+_IDENT = re.compile(r'[A-Za-z0-9_]*')
+_NOT_NEWLINE = re.compile(r'[^\n]')
+_BRACKET = re.compile(r'[{}()\[\];]')
+
+_CONTAINER = re.compile(
+    r'^(?:(?:abstract|sealed|base|final|interface|mixin)\s+)*(class|mixin|enum)\s+(\w+)')
+_EXTENSION = re.compile(r'^extension\s+(?:(\w+)\s*(?:<[^{]*?>)?\s+)?on\b\s*([\w.]+)')
+_TYPEDEF = re.compile(r'^typedef\s+(\w+)')
+_DIRECTIVE = re.compile(r'^(?:import|export|part|library)\b')
+_ACCESSOR = re.compile(r'\b(get|set)\s+(\w+)\s*$')
+_OPERATOR = re.compile(r'\boperator\s*(\S+)\s*$')
+_NAME_AT_END = re.compile(r'([A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)?)\s*$')
+_ANNOTATION = re.compile(r'\s*@[\w.]+\s*')
+_BODY_TAIL = re.compile(r'(?:\)|\basync\*?|\bsync\*|\bget\s+\w+)$')
+
+CONTAINER_KINDS = ('class', 'mixin', 'enum', 'extension')
+
+
+def _blank(s):
+    return _NOT_NEWLINE.sub(' ', s)
+
+
+def mask(text):
+    """Return text with comments and string literal contents replaced by spaces.
+
+    Offsets and newlines are preserved. Identifiers used in `$name` and
+    `${expr}` interpolations are kept so references inside strings still count.
+    """
+    out = list(text)
+    _scan_code(text, out, 0, False)
+    return ''.join(out)
+
+
+def _put_blank(out, text, start, end):
+    out[start:end] = _blank(text[start:end])
+
+
+def _scan_code(text, out, i, in_interpolation):
+    depth = 0
+    n = len(text)
+    while i < n:
+        m = _CODE_EVENT.search(text, i)
+        if not m:
+            return n
+        tok = m.group()
+        i = m.start()
+        if tok == '//':
+            end = text.find('\n', i)
+            end = n if end == -1 else end
+            _put_blank(out, text, i, end)
+            i = end
+        elif tok == '/*':
+            end = _skip_block_comment(text, i)
+            _put_blank(out, text, i, end)
+            i = end
+        elif tok in ('"', "'"):
+            raw = i > 0 and text[i - 1] == 'r' and (i < 2 or not (text[i - 2].isalnum() or text[i - 2] == '_'))
+            if raw:
+                out[i - 1] = ' '
+            i = _scan_string(text, out, i, raw)
+        elif tok == '{':
+            depth += 1
+            i += 1
+        else:  # '}'
+            if in_interpolation and depth == 0:
+                out[i] = ' '
+                return i + 1
+            depth -= 1
+            i += 1
+    return n
+
+
+def _skip_block_comment(text, i):
+    depth = 0
+    pos = i
+    while True:
+        m = _BLOCK_COMMENT_EVENT.search(text, pos)
+        if not m:
+            return len(text)
+        depth += 1 if m.group() == '/*' else -1
+        pos = m.end()
+        if depth == 0:
+            return pos
+
+
+def _scan_string(text, out, i, raw):
+    n = len(text)
+    quote = text[i] * 3 if text.startswith(text[i] * 3, i) else text[i]
+    out[i:i + len(quote)] = ' ' * len(quote)
+    j = i + len(quote)
+    multiline = len(quote) == 3
+    while j < n:
+        c = text[j]
+        if text.startswith(quote, j):
+            out[j:j + len(quote)] = ' ' * len(quote)
+            return j + len(quote)
+        if c == '\n':
+            if not multiline:
+                return j  # unterminated; let the code scanner resync
+            j += 1
+        elif c == '\\' and not raw:
+            _put_blank(out, text, j, min(j + 2, n))
+            j += 2
+        elif c == '$' and not raw and j + 1 < n and text[j + 1] == '{':
+            out[j] = out[j + 1] = ' '
+            j = _scan_code(text, out, j + 2, True)
+        elif c == '$' and not raw and j + 1 < n and _IDENT_START.match(text, j + 1):
+            out[j] = ' '
+            j = _IDENT.match(text, j + 1).end()
+        else:
+            out[j] = ' '
+            j += 1
+    return n
+
+
+class Declaration:
+    __slots__ = ('name', 'kind', 'parent', 'start', 'end', 'body_start',
+                 'signature', 'start_line', 'end_line')
+
+    def __init__(self, name, kind, parent, start, end, body_start, signature):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.start = start
+        self.end = end
+        self.body_start = body_start
+        self.signature = signature
+        self.start_line = None
+        self.end_line = None
+
+    @property
+    def qualified_name(self):
+        return f'{self.parent.name}.{self.name}' if self.parent else self.name
+
+    @property
+    def is_private(self):
+        return self.name.startswith('_')
+
+    def __repr__(self):
+        return f'<{self.kind} {self.qualified_name} L{self.start_line}-{self.end_line}>'
+
+
+def _annotation_end(header):
+    """Index just past any leading @annotations (with balanced argument lists)."""
+    pos = 0
+    while True:
+        m = _ANNOTATION.match(header, pos)
+        if not m:
+            return pos
+        pos = m.end()
+        if header.startswith('(', pos):
+            pos = _matching_paren(header, pos) + 1
+
+
+def _strip_annotations(header):
+    return header[_annotation_end(header):].strip()
+
+
+def _matching_paren(s, i):
+    depth = 0
+    for k in range(i, len(s)):
+        if s[k] in '([{':
+            depth += 1
+        elif s[k] in ')]}':
+            depth -= 1
+            if depth == 0:
+                return k
+    return len(s) - 1
+
+
+def _top_level_positions(header):
+    """First top-level '(' and '=' (not '=>' / '==') in a masked header, or -1."""
+    depth = 0
+    paren = equals = arrow = -1
+    for k, c in enumerate(header):
+        if c in '([{<':
+            if c == '(' and depth == 0 and paren == -1:
+                paren = k
+            if c != '<':
+                depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == '=' and depth == 0:
+            nxt = header[k + 1:k + 2]
+            prev = header[k - 1:k]
+            if nxt == '>' and arrow == -1:
+                arrow = k
+            elif nxt != '=' and prev not in '=!<>' and equals == -1:
+                equals = k
+    return paren, equals, arrow
+
+
+def _strip_type_params(s):
+    s = s.rstrip()
+    if not s.endswith('>'):
+        return s
+    depth = 0
+    for k in range(len(s) - 1, -1, -1):
+        if s[k] == '>':
+            depth += 1
+        elif s[k] == '<':
+            depth -= 1
+            if depth == 0:
+                return s[:k].rstrip()
+    return s
+
+
+def _first_top_level_item(s):
+    """Text before the first comma that is not nested in brackets or type arguments."""
+    depth = 0
+    for k, c in enumerate(s):
+        if c in '<([{':
+            depth += 1
+        elif c in '>)]}':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            return s[:k]
+    return s
+
+
+def _looks_like_body(header):
+    h = header.strip()
+    if not _BODY_TAIL.search(h):
+        return False
+    paren, equals, arrow = _top_level_positions(h)
+    if arrow != -1:
+        return False
+    return equals == -1 or (paren != -1 and paren < equals)
+
+
+def _classify(header, parent):
+    """Return (name, kind) for a member/top-level header, or None to skip it."""
+    h = _strip_annotations(header)
+    if not h or _DIRECTIVE.match(h):
+        return None
+    m = _CONTAINER.match(h)
+    if m:
+        return m.group(2), m.group(1)
+    m = _EXTENSION.match(h)
+    if m:
+        return m.group(1) or f'on {m.group(2)}', 'extension'
+    m = _TYPEDEF.match(h)
+    if m:
+        return m.group(1), 'typedef'
+    paren, equals, arrow = _top_level_positions(h)
+    cut = [p for p in (paren, equals, arrow) if p != -1]
+    prefix = h[:min(cut)] if cut else h
+    m = _ACCESSOR.search(prefix)
+    if m:
+        return m.group(2), 'getter' if m.group(1) == 'get' else 'setter'
+    m = _OPERATOR.search(prefix)
+    if m:
+        return f'operator {m.group(1)}', 'operator'
+    if paren != -1 and (equals == -1 or paren < equals):
+        m = _NAME_AT_END.search(_strip_type_params(h[:paren]))
+        if not m:
+            return None
+        name = m.group(1)
+        words = h[:paren].split()
+        if parent and (name == parent.name or name.startswith(parent.name + '.') or 'factory' in words):
+            return name, 'constructor'
+        return name, 'method' if parent else 'function'
+    m = _NAME_AT_END.search(_first_top_level_item(prefix))
+    if not m:
+        return None
+    return m.group(1), 'field' if parent else 'variable'
+
+
+class Outline:
+    def __init__(self, text):
+        self.text = text
+        self.masked = mask(text)
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        self.declarations = []
+        self._parse()
+        for decl in self.declarations:
+            decl.start_line = self.line_of(decl.start)
+            decl.end_line = self.line_of(max(decl.start, decl.end - 1))
+        self._by_start = sorted(self.declarations, key=lambda d: d.start)
+        self._starts = [d.start for d in self._by_start]
+
+    @classmethod
+    def from_path(cls, path):
+        with open(path, encoding='utf-8', newline='') as f:
+            return cls(f.read().replace('\r\n', '\n'))
+
+    def line_of(self, offset):
+        """1-based line number of a character offset."""
+        return bisect_right(self.line_starts, offset)
+
+    def offset_of(self, line, col=1):
+        """Character offset of a 1-based line/column, clamped to the file."""
+        line = max(1, min(line, len(self.line_starts)))
+        return min(self.line_starts[line - 1] + max(col, 1) - 1, len(self.text))
+
+    def line_text(self, line):
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.text)
+        return self.text[start:end]
+
+    def _signature(self, start, stop):
+        header = self.masked[start:stop]
+        offset = _annotation_end(header)
+        arrow = _top_level_positions(header[offset:])[2]
+        end = stop if arrow == -1 else start + offset + arrow
+        return ' '.join(self.text[start + offset:end].split())[:160]
+
+    def _parse(self):
+        masked = self.masked
+        stack = []  # (char, Declaration or None, role) with role in container/body/expr
+        seg_start = 0
+
+        def member_level():
+            return not stack or stack[-1][2] == 'container'
+
+        def current_parent():
+            return stack[-1][1] if stack else None
+
+        def first_code(start, stop):
+            seg = masked[start:stop]
+            return start + len(seg) - len(seg.lstrip())
+
+        for m in _BRACKET.finditer(masked):
+            c = m.group()
+            pos = m.start()
+            if c in '([':
+                stack.append((c, None, 'paren'))
+            elif c in ')]':
+                if stack and stack[-1][2] == 'paren':
+                    stack.pop()
+            elif c == '{':
+                if not member_level():
+                    stack.append((c, None, 'expr'))
+                    continue
+                header = masked[seg_start:pos]
+                parent = current_parent()
+                info = _classify(header, parent)
+                if info and info[1] in CONTAINER_KINDS:
+                    decl = self._declare(info, parent, first_code(seg_start, pos), pos, pos)
+                    stack.append((c, decl, 'container'))
+                    seg_start = pos + 1
+                elif info and _looks_like_body(header):
+                    decl = self._declare(info, parent, first_code(seg_start, pos), pos, pos)
+                    stack.append((c, decl, 'body'))
+                else:
+                    stack.append((c, None, 'expr'))
+            elif c == '}':
+                while stack and stack[-1][2] == 'paren':
+                    stack.pop()  # unbalanced source; resync on the brace
+                if not stack:
+                    continue
+                _, decl, role = stack.pop()
+                if role in ('container', 'body'):
+                    decl.end = pos + 1
+                    seg_start = pos + 1
+            elif c == ';' and member_level():
+                header = masked[seg_start:pos]
+                parent = current_parent()
+                if parent is not None and parent.kind == 'enum' and not any(
+                        d.parent is parent for d in self.declarations):
+                    seg_start = pos + 1
+                    continue  # enum value list
+                info = _classify(header, parent)
+                if info:
+                    start = first_code(seg_start, pos)
+                    decl = self._declare(info, parent, start, pos, None)
+                    decl.end = pos + 1
+                seg_start = pos + 1
+
+    def _declare(self, info, parent, start, sig_stop, body_start):
+        name, kind = info
+        decl = Declaration(name, kind, parent, start, None, body_start,
+                           self._signature(start, sig_stop))
+        self.declarations.append(decl)
+        return decl
+
+    def members(self, container):
+        return [d for d in self.declarations if d.parent is container]
+
+    def containers(self):
+        return [d for d in self.declarations if d.kind in CONTAINER_KINDS]
+
+    def find(self, name, parent_name=None):
+        return [d for d in self.declarations
+                if d.name == name and (parent_name is None or (d.parent and d.parent.name == parent_name))]
+
+    def enclosing(self, offset):
+        """Innermost declaration whose span contains offset, or None."""
+        # Declarations only nest through parents, so the last one starting at or
+        # before offset either contains it or one of its ancestors is the answer.
+        i = bisect_right(self._starts, offset)
+        decl = self._by_start[i - 1] if i else None
+        while decl is not None and not (decl.end is not None and offset < decl.end):
+            decl = decl.parent
+        return decl
+
+    def removal_span(self, decl):
+        """Whole-line span covering decl plus its doc comments/annotations and one blank separator."""
+        first = decl.start_line
+        while first > 1:
+            prev = self.line_text(first - 1).strip()
+            if prev.startswith(('///', '//', '/*', '*', '@')):
+                first -= 1
+            else:
+                break
+        last = decl.end_line
+        start = self.line_starts[first - 1]
+        end = self.line_starts[last] if last < len(self.line_starts) else len(self.text)
+        before_blank = first > 1 and not self.line_text(first - 1).strip()
+        after_blank = last < len(self.line_starts) and not self.line_text(last + 1).strip()
+        if before_blank and after_blank:
+            end = self.line_starts[last + 1] if last + 1 < len(self.line_starts) else len(self.text)
+        return start, end
@@ -0,0 +1,232 @@
+"""
+Find and remove unreferenced private declarations in the Dart sources.
+
+Dart privacy is per library, so each library (a file plus its `part` files)
+is analysed on its own. Every `_name` occurrence is attributed to the
+innermost declaration containing it, giving a reference graph between
+declarations. Public top-level declarations (and any code outside a
+declaration) are the roots; a container that is live keeps its public
+members live, and a referenced member keeps its container live. Whatever is
+not reachable is dead -- including helpers that are only called from other
+dead helpers. Names are matched without resolving receivers, so two private
+members sharing a name keep each other alive; the detector errs on the side
+of keeping code.
+
+Removal cuts the outermost dead declarations bottom-up in one pass per file
+and archives the removed source to
+backup_pre_refactor/<dir>/unused_helpers_backup_YYYYMMDD.dart first.
+Generated files (*.g.dart, *.freezed.dart) are analysed but never edited.
+
+Usage:
+    python tools/dead_code.py [--root lib] [--json]      # report only
+    python tools/dead_code.py --apply [--no-archive]
+"""
+from collections import defaultdict, deque
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from analyzer_report import cut_spans
+from codemod import read_source, encode_source
+from dart_outline import Outline
+from fsutil import atomic_write
+
+ARCHIVE_ROOT = 'backup_pre_refactor'
+GENERATED_SUFFIXES = ('.g.dart', '.freezed.dart')
+
+_PRIVATE_REF = re.compile(r'(?<![\w$])_[\w$]+')
+_PART = re.compile(r"^\s*part\s+'([^']+)'\s*;", re.M)
+_PART_OF = re.compile(r'^\s*part\s+of\b', re.M)
+
+
+class Library:
+    def __init__(self, path):
+        self.path = path
+        self.files = {}  # path -> (Outline, newline)
+
+    def add(self, path):
+        text, newline = read_source(path)
+        self.files[path] = (Outline(text), newline)
+
+
+def load_libraries(root='lib'):
+    """Group the Dart files under root into libraries. Returns [Library]."""
+    paths = sorted(p.as_posix() for p in Path(root).rglob('*.dart'))
+    parts = {}
+    owners = []
+    for path in paths:
+        text, _ = read_source(path)
+        if _PART_OF.search(text):
+            continue
+        owners.append(path)
+        for part in _PART.findall(text):
+            parts[Path(os.path.normpath(Path(path).parent / part)).as_posix()] = path
+    libraries = {}
+    for path in owners:
+        libraries[path] = Library(path)
+        libraries[path].add(path)
+    for part, owner in parts.items():
+        if os.path.exists(part):
+            libraries[owner].add(part)
+    # A part whose owner is outside root still gets analysed on its own.
+    for path in paths:
+        if path not in parts and path not in libraries:
+            libraries[path] = Library(path)
+            libraries[path].add(path)
+    return [libraries[p] for p in sorted(libraries)]
+
+
+def _attribute(outline, positions):
+    """Innermost declaration containing each (sorted) position, or None."""
+    decls = sorted((d for d in outline.declarations if d.end is not None),
+                   key=lambda d: (d.start, -d.end))
+    owners = []
+    stack = []
+    i = 0
+    for pos in positions:
+        while i < len(decls) and decls[i].start <= pos:
+            d = decls[i]
+            i += 1
+            while stack and stack[-1].end <= d.start:
+                stack.pop()
+            if d.end > pos:
+                stack.append(d)
+        while stack and stack[-1].end <= pos:
+            stack.pop()
+        owners.append(stack[-1] if stack else None)
+    return owners
+
+
+def _is_dead_ancestor(decl, dead):
+    parent = decl.parent
+    while parent is not None:
+        if parent in dead:
+            return True
+        parent = parent.parent
+    return False
+
+
+def find_dead(library):
+    """Outermost unreachable declarations of a library. Returns {path: [Declaration]}."""
+    by_name = defaultdict(list)
+    refs = defaultdict(set)  # Declaration -> names it references
+    members = defaultdict(list)
+    root_names = set()
+    file_of = {}
+    for path, (outline, _) in library.files.items():
+        for decl in outline.declarations:
+            by_name[decl.name].append(decl)
+            file_of[decl] = path
+            if decl.parent is not None:
+                members[decl.parent].append(decl)
+        matches = list(_PRIVATE_REF.finditer(outline.masked))
+        owners = _attribute(outline, [m.start() for m in matches])
+        for m, owner in zip(matches, owners):
+            if owner is None:
+                root_names.add(m.group())
+            elif owner.name != m.group():
+                refs[owner].add(m.group())
+
+    live = set()
+    queue = deque(d for d in file_of if d.parent is None and not d.is_private)
+    queue.extend(d for name in root_names for d in by_name.get(name, ()))
+    while queue:
+        decl = queue.popleft()
+        if decl in live:
+            continue
+        live.add(decl)
+        for name in refs.get(decl, ()):
+            queue.extend(by_name.get(name, ()))
+        queue.extend(m for m in members.get(decl, ()) if not m.is_private)
+        if decl.parent is not None:
+            queue.append(decl.parent)
+
+    dead = set(file_of) - live
+    result = defaultdict(list)
+    for decl in dead:
+        if not _is_dead_ancestor(decl, dead):
+            result[file_of[decl]].append(decl)
+    return {path: sorted(decls, key=lambda d: d.start) for path, decls in sorted(result.items())}
+
+
+def archive_path(path, today=None):
+    stamp = (today or datetime.date.today()).strftime('%Y%m%d')
+    return Path(ARCHIVE_ROOT) / Path(path).parent / f'unused_helpers_backup_{stamp}.dart'
+
+
+def write_archive(path, outline, decls, today=None):
+    """Append the removed declarations' source to the dated backup file for path."""
+    target = archive_path(path, today)
+    header = ''
+    if not target.exists():
+        header = (f'// Backup of unused private declarations removed by tools/dead_code.py '
+                  f'({(today or datetime.date.today()).isoformat()})\n'
+                  '// NOTE: This file is excluded by analysis_options.yaml to avoid lint noise.\n'
+                  '// If needed, restore selectively into the source file named above each block.\n')
+        existing = ''
+    else:
+        existing = target.read_text(encoding='utf-8')
+    blocks = [f'\n// ---- {path} ----\n']
+    for decl in decls:
+        start, end = outline.removal_span(decl)
+        owner = f' (in {decl.parent.qualified_name})' if decl.parent else ''
+        blocks.append(f'\n// {decl.qualified_name}{owner}, line {decl.start_line}\n')
+        blocks.append(outline.text[start:end].rstrip('\n') + '\n')
+    atomic_write(target, (existing + header + ''.join(blocks)).encode('utf-8'))
+    return target
+
+
+def remove_dead(library, dead, archive=True):
+    """Cut dead declarations from each editable file. Returns {path: archive path or None}."""
+    written = {}
+    for path, decls in dead.items():
+        if path.endswith(GENERATED_SUFFIXES):
+            continue
+        outline, newline = library.files[path]
+        written[path] = write_archive(path, outline, decls) if archive else None
+        new_text = cut_spans(outline.text, [outline.removal_span(d) for d in decls])
+        atomic_write(path, encode_source(new_text, newline))
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report or remove unreferenced private Dart declarations.')
+    parser.add_argument('--root', default='lib')
+    parser.add_argument('--apply', action='store_true', help='remove the dead declarations')
+    parser.add_argument('--no-archive', action='store_true', help='with --apply, skip the backup file')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    report = []
+    total_lines = 0
+    for library in load_libraries(args.root):
+        dead = find_dead(library)
+        for path, decls in dead.items():
+            for decl in decls:
+                lines = decl.end_line - decl.start_line + 1
+                total_lines += lines
+                report.append({'path': path, 'name': decl.qualified_name, 'kind': decl.kind,
+                               'line': decl.start_line, 'lines': lines,
+                               'generated': path.endswith(GENERATED_SUFFIXES)})
+        if args.apply and dead:
+            for path, target in remove_dead(library, dead, not args.no_archive).items():
+                print(f'{path}: removed {len(dead[path])} declaration(s)'
+                      + (f', archived to {target.as_posix()}' if target else ''), file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for item in report:
+            note = '  (generated, kept)' if item['generated'] else ''
+            print(f"{item['path']}:{item['line']}: {item['kind']} {item['name']} ({item['lines']} lines){note}")
+        verb = 'Removed' if args.apply else 'Found'
+        print(f'{verb} {len(report)} dead declaration(s), {total_lines} lines')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
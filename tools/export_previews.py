@@ -1,5 +1,7 @@
-from PIL import Image
 import os
+import sys
+
+from asset_store import AssetStore
 
 src_dir = os.path.join('assets','playstore')
 files = [
@@ -11,16 +13,15 @@ files = [
 ]
 
 os.makedirs(src_dir, exist_ok=True)
+# Sources that are already 1024x500 are hard-linked (or left alone if
+# unchanged) rather than re-encoded into byte-identical copies.
+store = AssetStore(link_duplicates='--copy' not in sys.argv)
 
 for f in files:
     path = os.path.join(src_dir, f)
     if not os.path.exists(path):
         print('Missing', path)
         continue
-    with Image.open(path) as im:
-        # ensure it's 1024x500; if not, center-crop or resize while preserving aspect
-        if im.size != (1024,500):
-            im = im.resize((1024,500), Image.LANCZOS)
-        out = os.path.join(src_dir, f.replace('.png','_preview_1024x500.png'))
-        im.save(out, 'PNG')
-        print('Saved', out)
+    out = os.path.join(src_dir, f.replace('.png','_preview_1024x500.png'))
+    _, outcome = store.derive(path, out, (1024,500))
+    print(outcome.capitalize(), out)
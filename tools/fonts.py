@@ -0,0 +1,79 @@
+"""
+Shared font registry for the asset generators.
+
+The font file is resolved once per process, FreeType faces are memoized per
+(path, size) with LRU eviction, and text bounding boxes are cached per
+(face, string). fit_text() picks the largest size that fits a box by binary
+search, so headline permutations don't need hand-tuned sizes.
+"""
+from functools import lru_cache
+import os
+
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/SegoeUI-Bold.ttf",
+    "C:/Windows/Fonts/Arialbd.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+]
+
+_measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+
+
+@lru_cache(maxsize=None)
+def font_path():
+    """First candidate font file that exists, or None to use PIL's default font."""
+    for p in FONT_CANDIDATES:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+@lru_cache(maxsize=64)
+def _face(path, size):
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+def font(size, path=None):
+    return _face(path or font_path(), int(size))
+
+
+@lru_cache(maxsize=4096)
+def _bbox(path, size, text):
+    face = _face(path, size)
+    if '\n' in text:
+        return _measure.multiline_textbbox((0, 0), text, font=face)
+    return _measure.textbbox((0, 0), text, font=face)
+
+
+def text_bbox(text, size, path=None):
+    """(left, top, right, bottom) of text drawn at the origin."""
+    return _bbox(path or font_path(), int(size), text)
+
+
+def text_size(text, size, path=None):
+    left, top, right, bottom = text_bbox(text, size, path)
+    return right - left, bottom - top
+
+
+def fit_text(text, max_width, max_height=None, lo=8, hi=256, path=None):
+    """Largest font size in [lo, hi] at which text fits within the box (lo if none do)."""
+    path = path or font_path()
+    if path is None:
+        return lo  # the bitmap default font does not scale
+    best = lo
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        w, h = text_size(text, mid, path)
+        if w <= max_width and (max_height is None or h <= max_height):
+            best = mid
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+def cache_info():
+    return {'faces': _face.cache_info(), 'bboxes': _bbox.cache_info()}
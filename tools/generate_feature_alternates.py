@@ -1,20 +1,23 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
 
+import fonts
+from raster import Canvas
+
 W, H = 1024, 500
 BACKGROUND = (37, 37, 37)
 BRAND = "Rebalance"
 
+# Headline box (logical px) used when a variant is asked to auto-fit its headline size
+HEADLINE_BOX = (W - 160, 190)
+
 def load_font(size):
-    paths = [
-        "C:/Windows/Fonts/SegoeUI-Bold.ttf",
-        "C:/Windows/Fonts/Arialbd.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
-    ]
-    for p in paths:
-        if os.path.exists(p):
-            return ImageFont.truetype(p, size)
-    return ImageFont.load_default()
+    return fonts.font(size)
+
+def headline_font(headline, size, scale, box=HEADLINE_BOX):
+    if size is None:
+        size = fonts.fit_text(headline, *box)
+    return load_font(size*scale)
 
 def save(img, name):
     out_dir = os.path.join('assets', 'playstore')
@@ -23,91 +26,86 @@ def save(img, name):
     img.save(path, 'PNG')
     print('Saved', path)
 
-def variant_left_brand():
-    img = Image.new('RGB', (W,H), BACKGROUND)
+def scale_silhouette(canvas, pivot_x, pivot_y, half_bar, bar_h, post_w, post_top, post_bottom):
+    bar_color = (60,130,255)
+    canvas.rect(pivot_x-half_bar, pivot_y-bar_h, pivot_x+half_bar, pivot_y+bar_h, bar_color)
+    canvas.rect(pivot_x-post_w, pivot_y-post_top, pivot_x+post_w, pivot_y+post_bottom, bar_color)
+
+def variant_left_brand(headline="Grow, stay\nbalanced.", headline_size=84, brand=BRAND, brand_size=28, scale=1):
+    canvas = Canvas(W, H, BACKGROUND, scale)
+    # simple scale silhouette at right (no icon)
+    scale_silhouette(canvas, W//2 + 90, H//2 + 40, 180, 6, 20, 8, 70)
+    img = canvas.to_image()
     draw = ImageDraw.Draw(img)
+    s = scale
     # small brand top-left
-    brand_font = load_font(28)
-    draw.text((80, 28), BRAND, font=brand_font, fill=(180,180,180))
+    brand_font = load_font(brand_size*s)
+    draw.text((80*s, 28*s), brand, font=brand_font, fill=(180,180,180))
     # headline smaller
-    hfont = load_font(84)
-    text = "Grow, stay\nbalanced."
-    draw.text((80, 80), text, font=hfont, fill=(245,245,245))
-    # simple scale silhouette at right (no icon)
-    pivot_x = W//2 + 90
-    pivot_y = H//2 + 40
-    bar_color = (60,130,255)
-    draw.rectangle([(pivot_x-180, pivot_y-6),(pivot_x+180,pivot_y+6)], fill=bar_color)
-    draw.rectangle([(pivot_x-20,pivot_y-8),(pivot_x+20,pivot_y+70)], fill=bar_color)
-    save(img, 'feature_graphic_left_brand.png')
-    # thumbnail
-    save(img.resize((512,250), Image.LANCZOS), 'feature_graphic_left_brand_thumb.png')
+    hfont = headline_font(headline, headline_size, s)
+    draw.text((80*s, 80*s), headline, font=hfont, fill=(245,245,245))
+    return img
 
-def variant_centered():
-    img = Image.new('RGB', (W,H), BACKGROUND)
+def variant_centered(headline="Grow, stay balanced.", headline_size=78, brand=BRAND, brand_size=30, scale=1):
+    canvas = Canvas(W, H, BACKGROUND, scale)
+    # scale silhouette lower
+    scale_silhouette(canvas, W//2, H//2 + 60, 200, 6, 20, 8, 70)
+    img = canvas.to_image()
     draw = ImageDraw.Draw(img)
+    s = scale
     # headline centered
-    hfont = load_font(78)
-    text = "Grow, stay balanced."
-    # measure with textbbox
-    bbox = draw.textbbox((0,0), text, font=hfont)
-    w = bbox[2] - bbox[0]
-    hh = bbox[3] - bbox[1]
-    draw.text(((W-w)/2, 110), text, font=hfont, fill=(245,245,245))
+    if headline_size is None:
+        headline_size = fonts.fit_text(headline, W - 160, 120)
+    hfont = load_font(headline_size*s)
+    # measure with the cached textbbox
+    w, hh = fonts.text_size(headline, headline_size*s)
+    draw.text(((W*s-w)/2, 110*s), headline, font=hfont, fill=(245,245,245))
     # brand small below
-    bfont = load_font(30)
-    bb = draw.textbbox((0,0), BRAND, font=bfont)
-    bw = bb[2] - bb[0]
-    bh = bb[3] - bb[1]
-    draw.text(((W-bw)/2, 110+hh+20), BRAND, font=bfont, fill=(180,180,180))
-    # scale silhouette lower
-    pivot_x = W//2
-    pivot_y = H//2 + 60
-    bar_color = (60,130,255)
-    draw.rectangle([(pivot_x-200, pivot_y-6),(pivot_x+200,pivot_y+6)], fill=bar_color)
-    draw.rectangle([(pivot_x-20,pivot_y-8),(pivot_x+20,pivot_y+70)], fill=bar_color)
-    save(img, 'feature_graphic_centered.png')
-    save(img.resize((512,250), Image.LANCZOS), 'feature_graphic_centered_thumb.png')
+    bfont = load_font(brand_size*s)
+    bw, _ = fonts.text_size(brand, brand_size*s)
+    draw.text(((W*s-bw)/2, 110*s+hh+20*s), brand, font=bfont, fill=(180,180,180))
+    return img
 
-def variant_minimal():
-    img = Image.new('RGB', (W,H), BACKGROUND)
+def variant_minimal(headline="Stay balanced.", headline_size=64, brand=BRAND, brand_size=44, scale=1):
+    canvas = Canvas(W, H, BACKGROUND, scale)
+    # small scale icon-left bottom
+    scale_silhouette(canvas, W//2 + 140, H//2 + 40, 150, 5, 18, 6, 60)
+    img = canvas.to_image()
     draw = ImageDraw.Draw(img)
+    s = scale
     # brand big and subtle
-    bfont = load_font(44)
-    draw.text((80, 60), BRAND, font=bfont, fill=(220,220,220))
+    bfont = load_font(brand_size*s)
+    draw.text((80*s, 60*s), brand, font=bfont, fill=(220,220,220))
     # single-line headline smaller
-    hfont = load_font(64)
-    draw.text((80, 120), "Stay balanced.", font=hfont, fill=(245,245,245))
-    # small scale icon-left bottom
-    pivot_x = W//2 + 140
-    pivot_y = H//2 + 40
-    bar_color = (60,130,255)
-    draw.rectangle([(pivot_x-150, pivot_y-5),(pivot_x+150,pivot_y+5)], fill=bar_color)
-    draw.rectangle([(pivot_x-18,pivot_y-6),(pivot_x+18,pivot_y+60)], fill=bar_color)
-    save(img, 'feature_graphic_minimal.png')
-    save(img.resize((512,250), Image.LANCZOS), 'feature_graphic_minimal_thumb.png')
+    hfont = headline_font(headline, headline_size, s)
+    draw.text((80*s, 120*s), headline, font=hfont, fill=(245,245,245))
+    return img
 
-def variant_choice_full_slogan():
-    img = Image.new('RGB', (W,H), BACKGROUND)
+def variant_choice_full_slogan(headline="Grow, Stay\nBalanced.", headline_size=88, brand=BRAND, brand_size=40, scale=1):
+    canvas = Canvas(W, H, BACKGROUND, scale)
+    # scale silhouette right
+    scale_silhouette(canvas, W//2 + 120, H//2 + 30, 200, 6, 20, 8, 72)
+    img = canvas.to_image()
     draw = ImageDraw.Draw(img)
+    s = scale
     # brand top-left
-    bfont = load_font(40)
-    draw.text((80, 40), BRAND, font=bfont, fill=(220,220,220))
+    bfont = load_font(brand_size*s)
+    draw.text((80*s, 40*s), brand, font=bfont, fill=(220,220,220))
     # full slogan (two parts) - keep 'Grow, Stay Balanced.' on two lines but slightly larger
-    hfont = load_font(88)
-    text = "Grow, Stay\nBalanced."
-    draw.text((80, 100), text, font=hfont, fill=(245,245,245))
-    # scale silhouette right
-    pivot_x = W//2 + 120
-    pivot_y = H//2 + 30
-    bar_color = (60,130,255)
-    draw.rectangle([(pivot_x-200, pivot_y-6),(pivot_x+200,pivot_y+6)], fill=bar_color)
-    draw.rectangle([(pivot_x-20,pivot_y-8),(pivot_x+20,pivot_y+72)], fill=bar_color)
-    save(img, 'feature_graphic_choice.png')
-    save(img.resize((512,250), Image.LANCZOS), 'feature_graphic_choice_thumb.png')
+    hfont = headline_font(headline, headline_size, s)
+    draw.text((80*s, 100*s), headline, font=hfont, fill=(245,245,245))
+    return img
+
+# layout name -> (renderer, output file); thumbnails are saved alongside as *_thumb.png
+LAYOUTS = {
+    'left_brand': (variant_left_brand, 'feature_graphic_left_brand.png'),
+    'centered': (variant_centered, 'feature_graphic_centered.png'),
+    'minimal': (variant_minimal, 'feature_graphic_minimal.png'),
+    'choice': (variant_choice_full_slogan, 'feature_graphic_choice.png'),
+}
 
 if __name__ == '__main__':
-    variant_left_brand()
-    variant_centered()
-    variant_minimal()
-    variant_choice_full_slogan()
+    for render, name in LAYOUTS.values():
+        img = render()
+        save(img, name)
+        save(img.resize((512,250), Image.LANCZOS), name.replace('.png', '_thumb.png'))
@@ -0,0 +1,375 @@
+"""
+Generate large, deterministic portfolio fixtures for load-testing the app.
+
+Writes one JSON document in the backup format produced by
+ExportService.exportAll (lib/services/export_service.dart): schemaVersion,
+generatedAt, accounts, liabilities, settings and snapshots, indented the way
+Dart's JsonEncoder.withIndent('  ') does it. Records are generated and written
+one at a time, so memory stays flat from the 10-record tier to the 1M tier.
+
+Data follows the models in lib/data/models.dart:
+    accounts     every kind, lognormal balances, allocations jittered around
+                 Account.defaultAllocations and summing to 1.0, occasional
+                 employer-stock concentration in brokerage/retirement
+    liabilities  every kind with APR, minimum payment, credit limits for cards
+                 and monthly due dates
+    snapshots    one per day (denser once the history would exceed
+                 --max-years), a random walk per asset class that ends exactly
+                 at the totals SnapshotService.createCurrentSnapshot would
+                 record for the generated accounts and liabilities
+
+The same --seed, tier and --as-of always produce byte-identical output.
+Pass --as-of today to place the newest snapshots inside the app's
+`getRecentSnapshots(days: 90)` window.
+
+Tiers (accounts / liabilities / snapshots):
+    10     5 / 2 / 3
+    1k     40 / 10 / 950
+    10k    300 / 100 / 9,600
+    100k   20,000 / 5,000 / 75,000
+    1m     200,000 / 50,000 / 750,000
+
+Usage:
+    python tools/generate_fixtures.py --tier 10k [--seed 7] [--as-of 2025-01-01|today]
+    python tools/generate_fixtures.py --tier 1m --out build/portfolio_1m.json.gz
+    python tools/generate_fixtures.py --accounts 50 --liabilities 5 --snapshots 3650 --out -
+"""
+import argparse
+import datetime
+import gzip
+import io
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+from fsutil import atomic_open
+
+SCHEMA_VERSION = 1  # ExportService.currentSchemaVersion
+DEFAULT_OUT_DIR = Path(__file__).resolve().parent / '.cache' / 'fixtures'
+DEFAULT_AS_OF = '2025-01-01'
+
+TIERS = {
+    '10': (5, 2, 3),
+    '1k': (40, 10, 950),
+    '10k': (300, 100, 9600),
+    '100k': (20000, 5000, 75000),
+    '1m': (200000, 50000, 750000),
+}
+
+BUCKETS = ('cash', 'bonds', 'usEq', 'intlEq', 'realEstate', 'alt')
+# Account.defaultAllocations, in BUCKETS order.
+DEFAULT_ALLOCATIONS = {
+    'cash': (1.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    'savings': (1.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    'brokerage': (0.05, 0.25, 0.55, 0.15, 0.0, 0.0),
+    'retirement': (0.05, 0.30, 0.50, 0.15, 0.0, 0.0),
+    'realEstateEquity': (0.0, 0.0, 0.0, 0.0, 1.0, 0.0),
+    'hsa': (0.30, 0.20, 0.40, 0.10, 0.0, 0.0),
+    '_529': (0.10, 0.30, 0.50, 0.10, 0.0, 0.0),
+    'crypto': (0.0, 0.0, 0.0, 0.0, 0.0, 1.0),
+    'other': (0.50, 0.20, 0.20, 0.10, 0.0, 0.0),
+}
+# kind: (weight, median balance, display names)
+ACCOUNT_KINDS = {
+    'cash': (15, 8000, ('Checking', 'Everyday Checking', 'Joint Checking')),
+    'savings': (15, 20000, ('Emergency Fund', 'High-Yield Savings', 'Vacation Savings')),
+    'brokerage': (20, 90000, ('Taxable Brokerage', 'Index Fund Account', 'Trading Account')),
+    'retirement': (25, 150000, ('401k Retirement', 'Roth IRA', 'Traditional IRA', '403b')),
+    'realEstateEquity': (5, 180000, ('Primary Residence', 'Rental Property', 'Lake House')),
+    'hsa': (5, 12000, ('Health Savings',)),
+    '_529': (5, 25000, ('College Fund', '529 Plan')),
+    'crypto': (5, 6000, ('Crypto Wallet', 'Exchange Account')),
+    'other': (5, 10000, ('Pension', 'Annuity', 'Cash Value Life')),
+}
+# kind: (weight, median balance, APR range, display names)
+LIABILITY_KINDS = {
+    'mortgage': (10, 250000, (0.03, 0.075), ('Primary Mortgage', 'HELOC', 'Rental Mortgage')),
+    'creditCard': (45, 3500, (0.16, 0.29), ('Chase Sapphire', 'Amex Gold', 'Store Card', 'Visa')),
+    'studentLoan': (15, 28000, (0.035, 0.08), ('Student Loans', 'Grad School Loan')),
+    'personalLoan': (15, 9000, (0.07, 0.18), ('Personal Loan', 'Car Loan')),
+    'other': (15, 5000, (0.05, 0.20), ('Medical Bill', 'Family Loan', 'Tax Payment Plan')),
+}
+INSTITUTIONS = ('Fidelity', 'Vanguard', 'Schwab', 'Chase', 'Ally', 'Wells Fargo', 'Coinbase', 'Local CU')
+# Annual (drift, volatility) of each snapshot series.
+WALKS = {
+    'cash': (0.01, 0.02),
+    'bonds': (0.03, 0.06),
+    'usEq': (0.08, 0.17),
+    'intlEq': (0.06, 0.18),
+    'realEstate': (0.04, 0.08),
+    'alt': (0.10, 0.60),
+    'liabilities': (-0.02, 0.03),
+}
+SNAPSHOT_TOTALS = ('cashTotal', 'bondsTotal', 'usEqTotal', 'intlEqTotal', 'reTotal', 'altTotal')
+
+
+def _iso(moment):
+    # DateTime.toIso8601String() for a local time: millisecond precision, no offset.
+    return moment.isoformat(timespec='milliseconds')
+
+
+def _money(value):
+    return round(value, 2)
+
+
+def _weighted(table):
+    kinds = list(table)
+    weights = [table[k][0] for k in kinds]
+    return kinds, weights
+
+
+def allocation(rng, kind):
+    """Default allocation for kind with +/-30% jitter, rounded to 4 places, summing to 1."""
+    base = DEFAULT_ALLOCATIONS[kind]
+    raw = [p * rng.uniform(0.7, 1.3) for p in base]
+    total = sum(raw)
+    pcts = [round(p / total, 4) for p in raw]
+    largest = max(range(len(pcts)), key=pcts.__getitem__)
+    pcts[largest] = round(pcts[largest] + 1.0 - sum(pcts), 4)
+    return pcts
+
+
+def accounts(rng, count, as_of, totals):
+    """Yield account maps; adds each account's bucket amounts to totals."""
+    kinds, weights = _weighted(ACCOUNT_KINDS)
+    for i in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        _, median, names = ACCOUNT_KINDS[kind]
+        balance = _money(median * rng.lognormvariate(0, 0.9))
+        pcts = allocation(rng, kind)
+        employer = 0.0
+        if kind in ('brokerage', 'retirement') and rng.random() < 0.2:
+            employer = round(rng.uniform(0.02, 0.35), 4)
+        for b, p in enumerate(pcts):
+            totals[b] += balance * p
+        yield {
+            'id': f'{kind.lstrip("_")}_{i + 1:07d}',
+            'name': f'{rng.choice(INSTITUTIONS)} {rng.choice(names)}',
+            'kind': kind,
+            'balance': balance,
+            'pctCash': pcts[0],
+            'pctBonds': pcts[1],
+            'pctUsEq': pcts[2],
+            'pctIntlEq': pcts[3],
+            'pctRealEstate': pcts[4],
+            'pctAlt': pcts[5],
+            'employerStockPct': employer,
+            'updatedAt': _iso(as_of - datetime.timedelta(seconds=rng.randrange(30 * 86400))),
+        }
+
+
+def liabilities(rng, count, as_of, totals):
+    """Yield liability maps; adds each balance to totals[0]."""
+    kinds, weights = _weighted(LIABILITY_KINDS)
+    for i in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        _, median, (apr_low, apr_high), names = LIABILITY_KINDS[kind]
+        balance = _money(median * rng.lognormvariate(0, 0.7))
+        apr = round(rng.uniform(apr_low, apr_high), 4)
+        if kind == 'creditCard':
+            limit = _money(max(balance * rng.uniform(1.2, 6.0), 1000.0))
+            min_payment = _money(max(25.0, balance * 0.03))
+        else:
+            limit = None
+            years = 30 if kind == 'mortgage' else rng.choice((3, 5, 10))
+            monthly = apr / 12
+            min_payment = _money(balance * monthly / (1 - (1 + monthly) ** (-12 * years)))
+        day = rng.randint(1, 28)
+        due = as_of.replace(day=day, hour=0, minute=0, second=0, microsecond=0)
+        if due <= as_of:
+            due = (due.replace(day=1) + datetime.timedelta(days=32)).replace(day=day)
+        totals[0] += balance
+        yield {
+            'id': f'{kind}_{i + 1:07d}',
+            'name': rng.choice(names),
+            'kind': kind,
+            'balance': balance,
+            'apr': apr,
+            'minPayment': min_payment,
+            'updatedAt': _iso(as_of - datetime.timedelta(seconds=rng.randrange(30 * 86400))),
+            'creditLimit': limit,
+            'nextPaymentDate': _iso(due) if rng.random() < 0.9 else None,
+            'paymentFrequencyDays': 30,
+            'dayOfMonth': day,
+        }
+
+
+def settings(rng):
+    """Settings map with the model defaults and a seeded risk band and budget."""
+    essentials = _money(rng.uniform(2500, 9000))
+    return {
+        'riskBand': rng.choice(('conservative', 'balanced', 'growth')),
+        'monthlyEssentials': essentials,
+        'driftThresholdPct': 0.05,
+        'notificationsEnabled': True,
+        'usEquityTargetPct': 0.8,
+        'isPro': True,
+        'biometricLockEnabled': False,
+        'darkModeEnabled': False,
+        'colorTheme': 'green',
+        'liquidityBondHaircut': 0.5,
+        'bucketCap': 0.2,
+        'employerStockThreshold': 0.1,
+        'monthlyIncome': _money(essentials * rng.uniform(1.5, 3.0)),
+        'incomeMultiplierFallback': 3.0,
+    }
+
+
+def _walk_steps(seed, count, dt):
+    """Cumulative log-returns per WALKS series, step by step (count - 1 steps)."""
+    rng = random.Random(f'{seed}:walk')
+    level = [0.0] * len(WALKS)
+    params = [((mu - sigma * sigma / 2) * dt, sigma * math.sqrt(dt)) for mu, sigma in WALKS.values()]
+    yield level
+    for _ in range(count - 1):
+        level = [x + drift + vol * rng.gauss(0, 1) for x, (drift, vol) in zip(level, params)]
+        yield level
+
+
+def snapshots(seed, count, as_of, spacing, finals):
+    """Yield snapshot maps, oldest first, ending at finals (BUCKETS totals + liabilities).
+
+    Each series is a geometric random walk. The walk is run once to find where
+    it ends and again to emit it shifted so its last point equals the final
+    value, which keeps memory constant for any count.
+    """
+    if count <= 0:
+        return
+    dt = spacing.total_seconds() / (365.25 * 86400)
+    end = None
+    for end in _walk_steps(seed, count, dt):
+        pass
+    rng = random.Random(f'{seed}:notes')
+    start = as_of - spacing * (count - 1)
+    for i, level in enumerate(_walk_steps(seed, count, dt)):
+        values = [_money(f * math.exp(x - e)) for f, x, e in zip(finals, level, end)]
+        manual = i < count - 1 and rng.random() < 0.02
+        snap = {'at': _iso(start + spacing * i)}
+        assets = values[:len(BUCKETS)]
+        snap['netWorth'] = _money(sum(assets) - values[-1])
+        snap.update(zip(SNAPSHOT_TOTALS, assets))
+        snap['liabilitiesTotal'] = values[-1]
+        snap['note'] = 'Manual snapshot' if manual else None
+        snap['source'] = 'manual' if manual else 'auto'
+        yield snap
+
+
+def _flat(record, depth):
+    """A flat map in indented layout at depth, via the C encoder (indent= uses the slow one)."""
+    inner = '  ' * (depth + 1)
+    body = json.dumps(record, separators=(',\n' + inner, ': '))
+    return '{\n' + inner + body[1:-1] + '\n' + '  ' * depth + '}'
+
+
+class JsonStream:
+    """Writes the export document section by section in JsonEncoder.withIndent('  ') layout."""
+
+    def __init__(self, out):
+        self.out = out
+        self.first = True
+
+    def _key(self, key):
+        self.out.write(('{\n' if self.first else ',\n') + f'  {json.dumps(key)}: ')
+        self.first = False
+
+    def value(self, key, value):
+        self._key(key)
+        self.out.write(_flat(value, 1) if isinstance(value, dict) else json.dumps(value))
+
+    def array(self, key, records):
+        self._key(key)
+        n = 0
+        for record in records:
+            self.out.write(('[\n    ' if n == 0 else ',\n    ') + _flat(record, 2))
+            n += 1
+        self.out.write('\n  ]' if n else '[]')
+        return n
+
+    def close(self):
+        self.out.write('{}' if self.first else '\n}')
+
+
+def generate(out, seed, n_accounts, n_liabilities, n_snapshots, as_of, max_years=30):
+    """Stream one fixture document to the text file out. Returns record counts."""
+    history_days = max_years * 365
+    spacing = datetime.timedelta(days=1)
+    if n_snapshots > history_days:
+        spacing = datetime.timedelta(seconds=history_days * 86400 // n_snapshots)
+    asset_totals = [0.0] * len(BUCKETS)
+    liability_total = [0.0]
+    doc = JsonStream(out)
+    doc.value('schemaVersion', SCHEMA_VERSION)
+    doc.value('generatedAt', _iso(as_of))
+    counts = {
+        'accounts': doc.array('accounts', accounts(random.Random(f'{seed}:accounts'),
+                                                   n_accounts, as_of, asset_totals)),
+        'liabilities': doc.array('liabilities', liabilities(random.Random(f'{seed}:liabilities'),
+                                                            n_liabilities, as_of, liability_total)),
+    }
+    doc.value('settings', settings(random.Random(f'{seed}:settings')))
+    finals = asset_totals + liability_total
+    counts['snapshots'] = doc.array('snapshots', snapshots(seed, n_snapshots, as_of, spacing, finals))
+    doc.close()
+    out.write('\n')
+    return counts
+
+
+def _as_of(value):
+    if value == 'today':
+        return datetime.datetime.combine(datetime.date.today(), datetime.time(9))
+    return datetime.datetime.fromisoformat(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate deterministic large-portfolio fixtures.')
+    parser.add_argument('--tier', choices=list(TIERS), default='1k')
+    parser.add_argument('--accounts', type=int, help='override the tier account count')
+    parser.add_argument('--liabilities', type=int, help='override the tier liability count')
+    parser.add_argument('--snapshots', type=int, help='override the tier snapshot count')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--as-of', default=DEFAULT_AS_OF,
+                        help="timestamp of the newest snapshot (ISO date/time, or 'today')")
+    parser.add_argument('--max-years', type=int, default=30,
+                        help='longest snapshot history; larger counts are spaced under a day apart')
+    parser.add_argument('--out', help="output path ('.gz' compresses, '-' for stdout); "
+                                      'default tools/.cache/fixtures/portfolio_<tier>_s<seed>.json')
+    args = parser.parse_args(argv)
+
+    n_accounts, n_liabilities, n_snapshots = TIERS[args.tier]
+    if args.accounts is not None:
+        n_accounts = args.accounts
+    if args.liabilities is not None:
+        n_liabilities = args.liabilities
+    if args.snapshots is not None:
+        n_snapshots = args.snapshots
+    as_of = _as_of(args.as_of)
+    generate_args = (args.seed, n_accounts, n_liabilities, n_snapshots, as_of, args.max_years)
+
+    if args.out == '-':
+        counts = generate(sys.stdout, *generate_args)
+        print(', '.join(f'{n} {k}' for k, n in counts.items()), file=sys.stderr)
+        return 0
+
+    out = args.out or DEFAULT_OUT_DIR / f'portfolio_{args.tier}_s{args.seed}.json'
+    with atomic_open(out) as raw:
+        if str(out).endswith('.gz'):
+            # mtime=0 keeps compressed output byte-identical between runs.
+            stream = gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=6, mtime=0)
+        else:
+            stream = raw
+        # Detach rather than close so atomic_open still owns the temp file.
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='\n')
+        counts = generate(text, *generate_args)
+        text.flush()
+        text.detach()
+        if stream is not raw:
+            stream.close()
+    summary = ', '.join(f'{n} {k}' for k, n in counts.items())
+    print(f'Wrote {out}: {summary}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
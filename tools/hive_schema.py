@@ -0,0 +1,360 @@
+"""
+Static Hive schema checker for lib/data/models.dart and models.g.dart.
+
+Extracts every `@HiveType(typeId: N)` class/enum with its `@HiveField(i)`
+fields (name and declared type) from the model source, and the typeId,
+read() casts and write() order from each generated adapter -- no
+build_runner, no analyzer. Comments are masked first, so commented-out
+annotations are ignored.
+
+Checks on the working tree:
+  - typeIds used twice, field indices used twice within a type
+  - adapters whose typeId, field indices, field names, casts or written
+    field count disagree with the model (a stale or hand-edited .g.dart)
+
+With --rev (default HEAD) the schema is also compared against that git
+revision, read straight from the object store (`git cat-file`):
+  - a type whose typeId changed, or a typeId now used by a different type
+  - a field or enum value that moved to another index (reordered), or an
+    index now holding a different field type/value (reused)
+  - removed types/fields (warnings: old records keep the data)
+  - new non-nullable fields read without a `??` default in the adapter,
+    and new fields without a _currentSchemaVersion bump
+    (SCHEMA_CHANGE_CHECKLIST.md steps 2 and 5)
+The adapters are compared against their own revision too, for drift the
+models do not show: adapters with no @HiveType (hand-written ones), typeIds
+or read()/write() indices changed in the .g.dart alone, and reads that lost
+their `??` default.
+
+Exits 1 on any error, so it can run as a pre-commit hook.
+
+Usage:
+    python tools/hive_schema.py [--rev HEAD | --no-rev] [--json]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from dart_outline import mask
+
+MODELS = 'lib/data/models.dart'
+ADAPTERS = 'lib/data/models.g.dart'
+REPOSITORIES = 'lib/data/repositories.dart'
+
+_HIVE_TYPE = re.compile(
+    r'@HiveType\(\s*typeId\s*:\s*(\d+)[^)]*\)\s*(?:@\w+(?:\([^)]*\))?\s*)*'
+    r'(?:abstract\s+)?(class|enum)\s+(\w+)[^{]*\{')
+_HIVE_FIELD = re.compile(r'@HiveField\(\s*(\d+)[^)]*\)')
+_ADAPTER = re.compile(r'class\s+(\w+)\s+extends\s+TypeAdapter<(\w+)>\s*\{')
+_TYPE_ID = re.compile(r'typeId\s*=\s*(\d+)')
+_READ_FIELD = re.compile(
+    r'(\w+)\s*[:=]\s*\(*\s*fields\[(\d+)\]\s+as\s+([\w.]+(?:<[^;]*?>)?\??)\)?([^,;\n]*)')
+_WRITE_COUNT = re.compile(r'\.\.writeByte\((\d+)\)\s*\.\.writeByte')
+_WRITE_FIELD = re.compile(r'writeByte\((\d+)\)\s*\.\.write\(obj\.(\w+)\)')
+_ENUM_READ = re.compile(r'case\s+(\d+)\s*:\s*return\s+\w+\.(\w+)\s*;')
+_ENUM_WRITE = re.compile(r'case\s+\w+\.(\w+)\s*:\s*writer\.writeByte\((\d+)\)')
+_SCHEMA_VERSION = re.compile(r'_currentSchemaVersion\s*=\s*(\d+)')
+_MODIFIERS = re.compile(r'\b(?:late|final|static|const|covariant|required)\s+')
+
+
+def _block(masked, open_brace):
+    """End offset (exclusive) of the brace block starting at open_brace."""
+    depth = 0
+    for i in range(open_brace, len(masked)):
+        c = masked[i]
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(masked)
+
+
+def _declaration(masked, start):
+    """Text from start up to the first `;`, `,` or `}` outside angle brackets."""
+    depth = 0
+    for i in range(start, len(masked)):
+        c = masked[i]
+        if c == '<':
+            depth += 1
+        elif c == '>':
+            depth -= 1
+        elif c in ';,}' and depth <= 0:
+            return masked[start:i]
+    return masked[start:]
+
+
+def _field(declaration):
+    """(name, type) from a field declaration such as `late double? x = 0`."""
+    decl = ' '.join(_MODIFIERS.sub('', declaration.split('=')[0]).split())
+    if ' ' not in decl:
+        return decl, None  # enum value
+    type_, name = decl.rsplit(' ', 1)
+    return name, type_.replace(' ', '')
+
+
+def parse_models(text):
+    """{type name: {'kind', 'type_id', 'fields': {index: (name, type)}, 'duplicates': [index]}}."""
+    masked = mask(text)
+    types = {}
+    for m in _HIVE_TYPE.finditer(masked):
+        body = masked[m.end():_block(masked, m.end() - 1)]
+        fields, duplicates = {}, []
+        for f in _HIVE_FIELD.finditer(body):
+            index = int(f.group(1))
+            if index in fields:
+                duplicates.append(index)
+            fields[index] = _field(_declaration(body, f.end()))
+        types[m.group(3)] = {'kind': m.group(2), 'type_id': int(m.group(1)),
+                             'fields': fields, 'duplicates': duplicates}
+    return types
+
+
+def _groups(m, text):
+    """m's groups read from text at the offsets m matched in the masked copy."""
+    return tuple(None if m.start(g) < 0 else text[m.start(g):m.end(g)]
+                 for g in range(1, m.re.groups + 1))
+
+
+def parse_adapters(text):
+    """{type name: {'adapter', 'type_id', 'read': {i: (name, cast, has_default)},
+    'write': {i: name}, 'write_count'}}."""
+    masked = mask(text)
+    adapters = {}
+    for m in _ADAPTER.finditer(masked):
+        start, end = m.end(), _block(masked, m.end() - 1)
+        body, source = masked[start:end], text[start:end]
+        type_id = _TYPE_ID.search(body)
+        count = _WRITE_COUNT.search(body)
+        read = {}
+        for r in _ENUM_READ.finditer(body):
+            index, value = _groups(r, source)
+            read[int(index)] = (value, None, True)
+        for r in _READ_FIELD.finditer(body):
+            name, index, cast, _ = _groups(r, source)
+            read[int(index)] = (name, cast, '??' in r.group(4))
+        write = {}
+        for w in _ENUM_WRITE.finditer(body):
+            value, index = _groups(w, source)
+            write[int(index)] = value
+        for w in _WRITE_FIELD.finditer(body):
+            index, name = _groups(w, source)
+            write[int(index)] = name
+        adapters[m.group(2)] = {'adapter': m.group(1),
+                                'type_id': int(type_id.group(1)) if type_id else None,
+                                'read': read, 'write': write,
+                                'write_count': int(count.group(1)) if count else None}
+    return adapters
+
+
+def _base(type_):
+    return (type_ or '').rstrip('?')
+
+
+class Report:
+    def __init__(self):
+        self.items = []
+
+    def error(self, type_name, message):
+        self.items.append({'level': 'error', 'type': type_name, 'message': message})
+
+    def warning(self, type_name, message):
+        self.items.append({'level': 'warning', 'type': type_name, 'message': message})
+
+    @property
+    def errors(self):
+        return [i for i in self.items if i['level'] == 'error']
+
+
+def check_tree(models, adapters, report):
+    seen = {}
+    for name, info in models.items():
+        other = seen.setdefault(info['type_id'], name)
+        if other != name:
+            report.error(name, f"typeId {info['type_id']} is also used by {other}")
+        for index in info['duplicates']:
+            report.error(name, f'@HiveField({index}) is used more than once')
+
+    for name, info in models.items():
+        adapter = adapters.get(name)
+        if adapter is None:
+            report.error(name, f'no adapter in {ADAPTERS}; run build_runner')
+            continue
+        if adapter['type_id'] != info['type_id']:
+            report.error(name, f"{adapter['adapter']} has typeId {adapter['type_id']}, "
+                               f"model has {info['type_id']}")
+        for index, (field, type_) in sorted(info['fields'].items()):
+            read = adapter['read'].get(index)
+            if read is None:
+                report.error(name, f'field {index} ({field}) is not read by {adapter["adapter"]}')
+            elif read[0] != field:
+                report.error(name, f'field {index} is {field} in the model but read as {read[0]}')
+            elif type_ and read[1] and _base(read[1]).split('<')[0] != _base(type_).split('<')[0]:
+                report.error(name, f'field {index} ({field}) is {type_} but read as {read[1]}')
+            elif type_ and read[1] and type_.endswith('?') and not read[1].endswith('?'):
+                report.error(name, f'nullable field {index} ({field}) is read as non-null {read[1]}')
+            written = adapter['write'].get(index)
+            if written is None:
+                report.error(name, f'field {index} ({field}) is not written by {adapter["adapter"]}')
+            elif written != field:
+                report.error(name, f'field {index} is {field} in the model but written from {written}')
+        extra = sorted(set(adapter['read']) - set(info['fields']))
+        if extra:
+            report.error(name, f"{adapter['adapter']} reads indices {extra} the model does not declare")
+        if info['kind'] == 'class' and adapter['write_count'] not in (None, len(info['fields'])):
+            report.error(name, f"{adapter['adapter']} writes a field count of {adapter['write_count']}, "
+                               f"model has {len(info['fields'])} fields")
+    for name, adapter in adapters.items():
+        if name not in models:
+            report.warning(name, f"{adapter['adapter']} has no @HiveType in {MODELS}")
+
+
+def check_history(old, new, adapters, report):
+    """Compare the schema at an older revision (old) with the current one (new)."""
+    old_by_id = {info['type_id']: name for name, info in old.items()}
+    for name, before in old.items():
+        after = new.get(name)
+        if after is None:
+            report.warning(name, f"type removed (typeId {before['type_id']}); "
+                                 'never reuse its typeId')
+            continue
+        if after['type_id'] != before['type_id']:
+            report.error(name, f"typeId changed {before['type_id']} -> {after['type_id']}")
+        old_index = {field: i for i, (field, _) in before['fields'].items()}
+        for index, (field, type_) in sorted(after['fields'].items()):
+            prior = before['fields'].get(index)
+            if field in old_index and old_index[field] != index:
+                report.error(name, f'{field} moved from index {old_index[field]} to {index}')
+            elif prior is not None and prior[0] != field:
+                what = 'value' if after['kind'] == 'enum' else 'field'
+                report.error(name, f'index {index} reused: was {what} {prior[0]}, now {field}')
+            elif prior is not None and _base(prior[1]) != _base(type_):
+                report.error(name, f'field {index} ({field}) changed type {prior[1]} -> {type_}')
+        for index, (field, _) in sorted(before['fields'].items()):
+            if index not in after['fields'] and field not in {f for f, _ in after['fields'].values()}:
+                report.warning(name, f'field {index} ({field}) removed; never reuse index {index}')
+    for name, after in new.items():
+        if name not in old:
+            reused = old_by_id.get(after['type_id'])
+            if reused is not None and reused in new:
+                continue  # reported as a typeId change on the other type
+            if reused is not None:
+                report.error(name, f"typeId {after['type_id']} previously belonged to {reused}")
+            continue
+        added = sorted(set(after['fields']) - set(old[name]['fields']))
+        adapter = adapters.get(name, {'read': {}})
+        for index in added:
+            field, type_ = after['fields'][index]
+            read = adapter['read'].get(index)
+            if (after['kind'] == 'class' and type_ and not type_.endswith('?')
+                    and read is not None and not read[2]):
+                report.error(name, f'new non-nullable field {index} ({field}) is read without a '
+                                   f"`?? default`; old records will fail (checklist step 5)")
+
+
+def check_adapter_history(old, new, old_models, models, report):
+    """Compare adapters at an older revision (old) with the current ones (new).
+
+    Index changes the models also show are left to check_history.
+    """
+    for name, before in old.items():
+        after = new.get(name)
+        if after is None:
+            continue
+        tracked = name in old_models and name in models
+        adapter = after['adapter']
+        if after['type_id'] != before['type_id'] and not (
+                tracked and models[name]['type_id'] != old_models[name]['type_id']):
+            report.error(name, f"{adapter} typeId changed {before['type_id']} -> {after['type_id']}")
+        for key, verb in (('read', 'reads'), ('write', 'writes')):
+            def field_at(entries, index):
+                value = entries.get(index)
+                return value[0] if key == 'read' and value else value
+
+            old_index = {field_at(before[key], i): i for i in before[key]}
+            for index in sorted(after[key]):
+                if tracked and (old_models[name]['fields'].get(index, (None,))[0]
+                                != models[name]['fields'].get(index, (None,))[0]):
+                    continue  # the model changed here; reported by check_history
+                field = field_at(after[key], index)
+                prior = field_at(before[key], index)
+                if field in old_index and old_index[field] != index:
+                    report.error(name, f'{adapter} {verb} {field} at index {index}, '
+                                       f'was {old_index[field]}')
+                elif prior is not None and prior != field:
+                    report.error(name, f'{adapter} index {index} reused: {verb} {field}, was {prior}')
+                elif key == 'read' and prior is not None and before['read'][index][2] \
+                        and not after['read'][index][2]:
+                    report.error(name, f'{adapter} reads field {index} ({field}) without its '
+                                       f'`?? default`; old records may fail')
+
+
+def fields_added(old, new):
+    return any(set(info['fields']) - set(old[name]['fields'])
+               for name, info in new.items() if name in old)
+
+
+def git_blob(rev, path):
+    """File contents at a revision from the object store, or None if absent there."""
+    proc = subprocess.run(['git', 'cat-file', 'blob', f'{rev}:{path}'],
+                          capture_output=True)
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.decode('utf-8').replace('\r\n', '\n')
+
+
+def read(path):
+    return Path(path).read_text(encoding='utf-8').replace('\r\n', '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check Hive typeIds/field indices for drift.')
+    parser.add_argument('--rev', default='HEAD', help='git revision to compare against (default HEAD)')
+    parser.add_argument('--no-rev', action='store_true', help='only check the working tree')
+    parser.add_argument('--models', default=MODELS)
+    parser.add_argument('--adapters', default=ADAPTERS)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    models = parse_models(read(args.models))
+    adapters = parse_adapters(read(args.adapters))
+    report = Report()
+    check_tree(models, adapters, report)
+
+    if not args.no_rev:
+        old_text = git_blob(args.rev, args.models)
+        old = {} if old_text is None else parse_models(old_text)
+        if old_text is None:
+            print(f'{args.models} not found at {args.rev}; skipping history checks', file=sys.stderr)
+        else:
+            check_history(old, models, adapters, report)
+            if fields_added(old, models):
+                before = _SCHEMA_VERSION.search(git_blob(args.rev, REPOSITORIES) or '')
+                after = _SCHEMA_VERSION.search(read(REPOSITORIES))
+                if before and after and before.group(1) == after.group(1):
+                    report.warning('-', f'fields were added but _currentSchemaVersion is still '
+                                        f'{after.group(1)} (checklist step 2)')
+        old_adapters = git_blob(args.rev, args.adapters)
+        if old_adapters is None:
+            print(f'{args.adapters} not found at {args.rev}; skipping adapter history checks',
+                  file=sys.stderr)
+        else:
+            check_adapter_history(parse_adapters(old_adapters), adapters, old, models, report)
+
+    if args.json:
+        print(json.dumps({'types': len(models), 'issues': report.items}, indent=2))
+    else:
+        for item in report.items:
+            print(f"{item['level'].upper():<7} {item['type']}: {item['message']}")
+        fields = sum(len(info['fields']) for info in models.values())
+        print(f'{len(models)} types, {fields} fields: {len(report.errors)} error(s), '
+              f'{len(report.items) - len(report.errors)} warning(s)')
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+NumPy-backed canvas for the feature graphic generators.
+
+Backgrounds, gradients and bars are drawn straight into one uint8 array
+with vectorized operations and handed to Pillow once, for the text pass and
+any image composites (the coin is pasted by Pillow). Coordinates are given
+in logical (1x) pixels; a Canvas created with scale=2 or scale=3 renders the
+same layout supersampled for high-DPI output.
+"""
+import numpy as np
+from PIL import Image
+
+
+class Canvas:
+    def __init__(self, width, height, background, scale=1):
+        self.scale = scale
+        self.width = width
+        self.height = height
+        self.pixels = np.empty((height * scale, width * scale, 3), dtype=np.uint8)
+        self.pixels[:] = background
+
+    def px(self, value):
+        """Logical coordinate -> device pixels."""
+        return int(round(value * self.scale))
+
+    def vertical_gradient(self, color, darken):
+        """Fill with color, darkening linearly by `darken` (0..1) from top to bottom."""
+        rows = self.pixels.shape[0]
+        alpha = np.arange(rows, dtype=np.float64) / rows
+        shade = (np.asarray(color, dtype=np.float64)[None, :] * (1 - darken * alpha)[:, None])
+        self.pixels[:] = shade.astype(np.uint8)[:, None, :]
+
+    def rect(self, x0, y0, x1, y1, color):
+        """Filled rectangle; like ImageDraw.rectangle, both corners are inclusive."""
+        top, bottom = max(self.px(y0), 0), max(self.px(y1 + 1), 0)
+        left, right = max(self.px(x0), 0), max(self.px(x1 + 1), 0)
+        self.pixels[top:bottom, left:right] = color
+
+    def to_image(self):
+        return Image.fromarray(self.pixels, 'RGB')
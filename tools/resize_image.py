@@ -1,7 +1,12 @@
 from PIL import Image
 import sys
 
-if len(sys.argv) < 4:
+from batch_resize import fit
+
+# Single-image resize. For whole icon sets use batch_resize.py, which decodes
+# each source once and produces every size in tools/icon_sizes.json.
+
+if len(sys.argv) < 5:
     print("Usage: python resize_image.py <input> <output> <width> <height>")
     sys.exit(1)
 
@@ -13,12 +18,5 @@ height = int(sys.argv[4])
 img = Image.open(input_path)
 # Preserve aspect ratio by fitting into box then centering on transparent background if needed
 img = img.convert('RGBA')
-img.thumbnail((width, height), Image.LANCZOS)
-
-background = Image.new('RGBA', (width, height), (255,255,255,0))
-# center
-x = (width - img.width) // 2
-y = (height - img.height) // 2
-background.paste(img, (x, y), img)
-background.save(output_path)
-print(f"Saved resized image to {output_path}")
\ No newline at end of file
+fit(img, (width, height)).save(output_path, optimize=output_path.lower().endswith('.png'))
+print(f"Saved resized image to {output_path}")
@@ -0,0 +1,262 @@
+"""
+Split a large Dart library file into `part` files by call-graph clusters.
+
+Movable units are the file's top-level declarations (except the classes
+being split) and the movable methods of the classes named with --class.
+A method is movable when it is not static, not an @override, not a
+constructor or field, and does not call setState/super (protected or
+class-bound calls that do not work from an extension). Units reference each
+other by name; clusters are grown by average-linkage merging of the most
+strongly connected groups up to --max-lines, small leftovers are folded into
+their best neighbour or a shared "misc" part.
+
+Top-level units move verbatim. Methods move into a private extension on
+their class (`extension _DashboardScreenScore on DashboardScreen`), which
+keeps implicit-`this` calls working in both directions. Part files share the
+owner's imports and privacy, so nothing else changes. The class and its
+non-movable members stay in the owner file.
+
+Nothing is written unless --write is given; the default prints the planned
+parts and their expected sizes.
+
+Usage:
+    python tools/split_library.py lib/features/dashboard/dashboard_screen.dart \\
+        --class DashboardScreen [--max-lines 1500] [--min-lines 150] [--json] [--write]
+"""
+from collections import Counter, defaultdict
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from analyzer_report import cut_spans
+from codemod import read_source, encode_source
+from dart_outline import Outline
+from fsutil import atomic_write
+
+_IDENT = re.compile(r'(?<![\w$])[A-Za-z_$][\w$]*')
+_PINNED_CALLS = re.compile(r'(?<![\w$.])(?:setState|super)\b')
+_DIRECTIVE = re.compile(r'^(?:import|export|part|library)\b[^;]*;[ \t]*\n', re.M)
+_NAME_WORDS = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])')
+STOP_WORDS = {'build', 'get', 'show', 'on', 'handle', 'create', 'is', 'has', 'to', 'the', 'for',
+              'with', 'widget', 'state', 'open', 'set', 'update', 'format', 'calculate', 'and'}
+
+
+class Unit:
+    __slots__ = ('decl', 'span', 'lines', 'refs', 'owner')
+
+    def __init__(self, decl, span, text, owner):
+        self.decl = decl
+        self.span = span
+        self.lines = text.count('\n', span[0], span[1])
+        self.refs = Counter()
+        self.owner = owner  # class name for extension members, None for top-level
+
+    @property
+    def name(self):
+        return self.decl.name
+
+
+def movable(outline, decl):
+    """Why decl must stay in its class, or None when it can move to an extension."""
+    if decl.kind not in ('method', 'getter', 'setter'):
+        return decl.kind
+    header = outline.masked[outline.removal_span(decl)[0]:decl.body_start or decl.end]
+    if '@override' in header or re.search(r'^\s*(?:external\s+)?static\b', decl.signature):
+        return 'override' if '@override' in header else 'static'
+    if _PINNED_CALLS.search(outline.masked, decl.start, decl.end):
+        return 'setState/super'
+    return None
+
+
+def collect_units(outline, classes):
+    units = []
+    pinned = Counter()
+    for decl in outline.declarations:
+        if decl.parent is None and decl.name not in classes:
+            units.append(Unit(decl, outline.removal_span(decl), outline.text, None))
+        elif decl.parent is not None and decl.parent.parent is None and decl.parent.name in classes:
+            reason = movable(outline, decl)
+            if reason:
+                pinned[reason] += 1
+            else:
+                units.append(Unit(decl, outline.removal_span(decl), outline.text, decl.parent.name))
+    by_name = defaultdict(list)
+    for unit in units:
+        by_name[unit.name].append(unit)
+    for unit in units:
+        for m in _IDENT.finditer(outline.masked, unit.decl.start, unit.decl.end):
+            for other in by_name.get(m.group(), ()):
+                if other is not unit:
+                    unit.refs[id(other)] += 1
+    return units, pinned
+
+
+def cluster(units, max_lines, min_lines):
+    """Partition units into lists by average-linkage merging on reference counts."""
+    index = {id(u): i for i, u in enumerate(units)}
+    groups = {i: [u] for i, u in enumerate(units)}
+    sizes = {i: u.lines for i, u in enumerate(units)}
+    weight = defaultdict(float)
+    for i, u in enumerate(units):
+        for target, n in u.refs.items():
+            j = index[target]
+            if i != j:
+                weight[frozenset((i, j))] += n
+
+    def merge(a, b):
+        groups[a].extend(groups.pop(b))
+        sizes[a] += sizes.pop(b)
+        for key in [k for k in weight if b in k]:
+            w = weight.pop(key)
+            other = next(iter(key - {b}), None)
+            if other is not None and other != a:
+                weight[frozenset((a, other))] += w
+
+    while True:
+        best = None
+        for key, w in weight.items():
+            a, b = tuple(key)
+            if sizes[a] + sizes[b] > max_lines:
+                continue
+            score = w / (len(groups[a]) * len(groups[b]))
+            if best is None or score > best[0]:
+                best = (score, a, b)
+        if best is None:
+            break
+        merge(best[1], best[2])
+
+    # Fold small groups into their strongest neighbour, or pool them.
+    for g in sorted(groups, key=lambda g: sizes[g]):
+        if g not in groups or sizes[g] >= min_lines:
+            continue
+        neighbours = [(w, next(iter(k - {g}))) for k, w in weight.items() if g in k]
+        neighbours = [(w, n) for w, n in neighbours if sizes[n] + sizes[g] <= max_lines]
+        if neighbours:
+            merge(max(neighbours)[1], g)
+    parts = []
+    misc = []
+    for g, members in groups.items():
+        if sizes[g] >= min_lines:
+            parts.append(members)
+        else:
+            misc.extend(members)
+    misc.sort(key=lambda u: u.span[0])
+    chunk = []
+    for unit in misc:
+        if chunk and sum(u.lines for u in chunk) + unit.lines > max_lines:
+            parts.append(chunk)
+            chunk = []
+        chunk.append(unit)
+    if chunk:
+        parts.append(chunk)
+    for members in parts:
+        members.sort(key=lambda u: u.span[0])
+    return sorted(parts, key=lambda members: members[0].span[0])
+
+
+def part_name(members, taken):
+    words = Counter()
+    for unit in members:
+        for word in _NAME_WORDS.findall(unit.name):
+            word = word.lower()
+            if word not in STOP_WORDS and len(word) > 2:
+                words[word] += unit.lines
+    name = '_'.join(w for w, _ in words.most_common(2)) or 'misc'
+    candidate, n = name, 2
+    while candidate in taken:
+        candidate, n = f'{name}{n}', n + 1
+    taken.add(candidate)
+    return candidate
+
+
+def render_part(owner_file, outline, members, slug):
+    out = [f"part of '{owner_file}';\n"]
+    for unit in (u for u in members if u.owner is None):
+        out.append('\n' + outline.text[unit.span[0]:unit.span[1]].strip('\n') + '\n')
+    by_class = defaultdict(list)
+    for unit in members:
+        if unit.owner is not None:
+            by_class[unit.owner].append(unit)
+    for cls, units in by_class.items():
+        ext = '_' + cls.lstrip('_') + ''.join(w[:1].upper() + w[1:] for w in slug.split('_'))
+        body = '\n'.join(outline.text[u.span[0]:u.span[1]].strip('\n') + '\n' for u in units)
+        out.append(f'\nextension {ext} on {cls} {{\n{body}}}\n')
+    return ''.join(out)
+
+
+def plan(path, classes, max_lines, min_lines):
+    text, newline = read_source(path)
+    outline = Outline(text)
+    units, pinned = collect_units(outline, classes)
+    parts = cluster(units, max_lines, min_lines)
+    stem = Path(path).stem
+    taken = set()
+    planned = []
+    for members in parts:
+        slug = part_name(members, taken)
+        part_path = Path(path).with_name(f'{stem}_{slug}.dart').as_posix()
+        planned.append({'path': part_path, 'slug': slug, 'units': members,
+                        'source': render_part(Path(path).name, outline, members, slug)})
+    moved = [u.span for members in parts for u in members]
+    remaining = cut_spans(text, moved)
+    directives = list(_DIRECTIVE.finditer(remaining))
+    at = directives[-1].end() if directives else 0
+    part_lines = ''.join(f"part '{Path(p['path']).name}';\n" for p in planned)
+    owner = remaining[:at] + ('\n' if directives else '') + part_lines + remaining[at:] if planned else text
+    return {'path': path, 'newline': newline, 'owner': owner, 'parts': planned,
+            'lines_before': text.count('\n'), 'pinned': pinned}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Split a Dart library into part files by call-graph clusters.')
+    parser.add_argument('path')
+    parser.add_argument('--class', dest='classes', action='append', default=[],
+                        help='class whose movable methods go to extensions (repeatable)')
+    parser.add_argument('--max-lines', type=int, default=1500)
+    parser.add_argument('--min-lines', type=int, default=150)
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--write', action='store_true', help='write the owner and part files')
+    args = parser.parse_args(argv)
+
+    if re.search(r'^\s*part\s+of\b', read_source(args.path)[0], re.M):
+        print(f'{args.path} is a part file; split its library owner instead', file=sys.stderr)
+        return 1
+    result = plan(args.path, set(args.classes), args.max_lines, args.min_lines)
+    for part in result['parts']:
+        if os.path.exists(part['path']):
+            print(f"{part['path']} already exists; refusing to overwrite", file=sys.stderr)
+            return 1
+
+    report = {
+        'owner': {'path': result['path'], 'lines_before': result['lines_before'],
+                  'lines_after': result['owner'].count('\n'), 'pinned': dict(result['pinned'])},
+        'parts': [{'path': p['path'], 'lines': p['source'].count('\n'),
+                   'declarations': [u.decl.qualified_name for u in p['units']]}
+                  for p in result['parts']],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        owner = report['owner']
+        pinned = ', '.join(f'{n} {why}' for why, n in sorted(owner['pinned'].items()))
+        print(f"{owner['path']}: {owner['lines_before']} -> {owner['lines_after']} lines"
+              + (f' (kept in class: {pinned})' if pinned else ''))
+        for part in report['parts']:
+            names = part['declarations']
+            shown = ', '.join(names[:4]) + (f', +{len(names) - 4} more' if len(names) > 4 else '')
+            print(f"  {part['path']}: {part['lines']} lines, {len(names)} declarations ({shown})")
+
+    if args.write:
+        newline = result['newline']
+        for part in result['parts']:
+            atomic_write(part['path'], encode_source(part['source'], newline))
+        atomic_write(result['path'], encode_source(result['owner'], newline))
+        print(f"Wrote {len(result['parts'])} part file(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
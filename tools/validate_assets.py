@@ -0,0 +1,184 @@
+"""
+Validate image assets against the store/launcher constraints in tools/asset_rules.json.
+
+Dimensions, color mode and alpha are read straight from the PNG IHDR/tRNS
+chunks or the JPEG SOF segment; pixel data is never decoded. Files are read
+in parallel. Every image under the configured roots is inspected, so an
+unreadable file is reported even when no rule targets it.
+
+Usage:
+    python tools/validate_assets.py [--rules tools/asset_rules.json] [--json]
+
+Exits 1 when any file violates a rule or cannot be read.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import fnmatch
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+DEFAULT_RULES = Path(__file__).resolve().parent / 'asset_rules.json'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_COLOR_TYPES = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+JPEG_COMPONENTS = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+# SOF0..SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class HeaderError(Exception):
+    pass
+
+
+def _read_png(f):
+    f.seek(8)
+    length, kind = struct.unpack('>I4s', f.read(8))
+    if kind != b'IHDR' or length < 13:
+        raise HeaderError('PNG without IHDR')
+    width, height, depth, color_type = struct.unpack('>IIBB', f.read(10))
+    mode = PNG_COLOR_TYPES.get(color_type)
+    if mode is None:
+        raise HeaderError(f'unknown PNG color type {color_type}')
+    alpha = color_type in (4, 6)
+    # Walk chunk headers (skipping their data) up to IDAT for a tRNS chunk.
+    f.seek(8 + 8 + length + 4)
+    while not alpha:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, kind = struct.unpack('>I4s', header)
+        if kind == b'tRNS':
+            alpha = True
+        elif kind in (b'IDAT', b'IEND'):
+            break
+        f.seek(length + 4, os.SEEK_CUR)
+    return {'format': 'PNG', 'width': width, 'height': height, 'mode': mode,
+            'bit_depth': depth, 'alpha': alpha}
+
+
+def _read_jpeg(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise HeaderError('JPEG without a frame header')
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':  # fill bytes
+            marker = f.read(1)
+        if not marker:
+            raise HeaderError('truncated JPEG')
+        code = marker[0]
+        if code in (0x01, 0xD8) or 0xD0 <= code <= 0xD7:
+            continue  # markers without a length field
+        length = struct.unpack('>H', f.read(2))[0]
+        if code in JPEG_SOF:
+            depth, height, width, components = struct.unpack('>BHHB', f.read(6))
+            return {'format': 'JPEG', 'width': width, 'height': height,
+                    'mode': JPEG_COMPONENTS.get(components, f'{components}ch'),
+                    'bit_depth': depth, 'alpha': False}
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_header(path):
+    """Format, dimensions, mode and alpha of an image, from its header only."""
+    with open(path, 'rb') as f:
+        head = f.read(8)
+        if head == PNG_SIGNATURE:
+            return _read_png(f)
+        if head[:2] == b'\xff\xd8':
+            return _read_jpeg(f)
+    raise HeaderError('not a PNG or JPEG file')
+
+
+def check(info, rule):
+    """List of violation messages for one file against one rule."""
+    problems = []
+    w, h = info['width'], info['height']
+    if 'width' in rule and w != rule['width'] or 'height' in rule and h != rule['height']:
+        problems.append(f"size {w}x{h}, expected {rule.get('width', w)}x{rule.get('height', h)}")
+    if rule.get('square') and w != h:
+        problems.append(f'size {w}x{h}, expected a square image')
+    if 'min_width' in rule and w < rule['min_width']:
+        problems.append(f"width {w} below minimum {rule['min_width']}")
+    if 'max_width' in rule and w > rule['max_width']:
+        problems.append(f"width {w} above maximum {rule['max_width']}")
+    if 'alpha' in rule and info['alpha'] != rule['alpha']:
+        problems.append('has an alpha channel' if info['alpha'] else 'has no alpha channel')
+    if 'formats' in rule and info['format'] not in rule['formats']:
+        problems.append(f"format {info['format']}, expected {'/'.join(rule['formats'])}")
+    if 'max_bytes' in rule and info['bytes'] > rule['max_bytes']:
+        problems.append(f"{info['bytes']} bytes, limit {rule['max_bytes']}")
+    return problems
+
+
+def matches(path, rule):
+    # fnmatch's '*' already crosses '/'; '**/' may also match no directory at all.
+    pattern = rule['glob']
+    if not fnmatch.fnmatch(path, pattern) and not fnmatch.fnmatch(path, pattern.replace('**/', '')):
+        return False
+    name = os.path.basename(path)
+    return not any(fnmatch.fnmatch(name, pattern) for pattern in rule.get('exclude', ()))
+
+
+def collect(config):
+    extensions = tuple(config.get('image_extensions', ('.png', '.jpg', '.jpeg')))
+    files = set()
+    for root in config.get('roots', ['assets']):
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                if name.lower().endswith(extensions):
+                    files.add(Path(dirpath, name).as_posix())
+    return sorted(files)
+
+
+def inspect(path, rules):
+    result = {'path': path, 'rules': [], 'errors': []}
+    try:
+        info = read_header(path)
+    except (HeaderError, OSError, struct.error) as e:
+        result['errors'].append(f'unreadable header: {e}')
+        return result
+    info['bytes'] = os.path.getsize(path)
+    result.update(info)
+    for rule in rules:
+        if matches(path, rule):
+            result['rules'].append(rule['name'])
+            result['errors'].extend(f"{rule['name']}: {p}" for p in check(info, rule))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check image assets against store constraints.')
+    parser.add_argument('--rules', default=str(DEFAULT_RULES))
+    parser.add_argument('--json', action='store_true', help='machine-readable report on stdout')
+    parser.add_argument('--jobs', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = json.loads(Path(args.rules).read_text(encoding='utf-8'))
+    rules = config['rules']
+    files = collect(config)
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(lambda p: inspect(p, rules), files))
+
+    failed = [r for r in results if r['errors']]
+    if args.json:
+        print(json.dumps({'checked': len(results), 'failed': len(failed), 'files': results}, indent=2))
+    else:
+        for r in results:
+            if r['errors']:
+                for error in r['errors']:
+                    print(f"FAIL {r['path']}: {error}")
+            elif r['rules']:
+                print(f"ok   {r['path']} {r['width']}x{r['height']} {r['mode']}")
+        unmatched = sum(1 for r in results if not r['rules'] and not r['errors'])
+        print(f'{len(results)} files checked, {len(failed)} failed, {unmatched} not covered by a rule')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+Watch asset inputs and codemod rules and rebuild only what they affect.
+
+One long-lived process keeps the renderer modules imported, fonts and faces
+cached (fonts.py), the coin built from the icon cached
+(generate_feature_graphic.coin_face) and codemod rule sets compiled. Changes
+are collected from inotify (via ctypes; a stat poller is used where inotify
+is unavailable) and debounced, then mapped through the dependency graph:
+
+    icon / variant input file  -> variants that read it
+    manifest                   -> variants whose params/outputs changed
+    font file, fonts.py,
+    raster.py                  -> every variant
+    generate_*.py              -> variants using that layout (module reloaded)
+    variant                    -> its image, thumbnail and preview
+
+Affected variants are re-checked against the build_assets cache key, so an
+edit that does not change the result renders nothing, and outputs go through
+AssetStore, so unchanged bytes are never rewritten. The build cache is
+shared with build_assets.py.
+
+With --codemod RULES, saving a Dart file under lib/ re-applies the rules to
+that file, and editing the rules file re-applies them to all of lib/.
+
+Usage:
+    python tools/watch.py [--manifest tools/assets_manifest.json] [--codemod RULES ...]
+                          [--debounce 0.15] [--poll]
+"""
+from collections import defaultdict
+import argparse
+import ctypes
+import ctypes.util
+import importlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+import build_assets
+from codemod import Codemod, read_source, encode_source
+from fsutil import atomic_write
+
+TOOLS_DIR = Path(__file__).resolve().parent
+# Reload order matters: renderers bind names from fonts/raster at import time.
+SHARED_MODULES = ('fonts', 'raster')
+
+IN_MODIFY = 0x002
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_CLOSE_WRITE = 0x008
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_MODIFY
+_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Directory watches through libc's inotify; reports changed file paths."""
+
+    def __init__(self, directories, recursive=()):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        self.recursive = {os.path.abspath(d) for d in recursive}
+        for directory in set(directories) | self.recursive:
+            self.add(directory)
+
+    def add(self, directory):
+        directory = os.path.abspath(directory)
+        walk = [directory]
+        if any(directory == r or directory.startswith(r + os.sep) for r in self.recursive):
+            walk = [root for root, _, _ in os.walk(directory)]
+        for path in walk:
+            wd = self._add(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd >= 0:
+                self.dirs[wd] = path
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if wd not in self.dirs or not name:
+                    continue
+                path = os.path.join(self.dirs[wd], os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self.add(path)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+                    changed.add(path)
+                elif mask & IN_MODIFY:
+                    changed.add(path)  # the close/move that follows is coalesced
+        return changed
+
+
+class PollingWatcher:
+    """Fallback: compare (mtime, size) of the watched files every interval."""
+
+    def __init__(self, files, recursive=(), interval=0.25, suffix='.dart'):
+        self.files = {os.path.abspath(f) for f in files}
+        self.recursive = [os.path.abspath(d) for d in recursive]
+        self.interval = interval
+        self.suffix = suffix
+        self.stamps = self._scan()
+
+    def _scan(self):
+        paths = set(self.files)
+        for root in self.recursive:
+            for dirpath, _, names in os.walk(root):
+                paths.update(os.path.join(dirpath, n) for n in names if n.endswith(self.suffix))
+        stamps = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamps[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        return stamps
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + (timeout if timeout is not None else 3600)
+        while True:
+            time.sleep(min(self.interval, max(0, deadline - time.monotonic())))
+            stamps = self._scan()
+            changed = {p for p in set(stamps) | set(self.stamps) if stamps.get(p) != self.stamps.get(p)}
+            self.stamps = stamps
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+
+class AssetGraph:
+    """Maps changed files to the manifest variants that depend on them."""
+
+    def __init__(self, manifest_path):
+        self.manifest_path = os.path.abspath(manifest_path)
+        self.load()
+
+    def load(self):
+        self.manifest = build_assets.load_manifest(self.manifest_path)
+        self.by_name = {v['name']: v for v in self.manifest['variants']}
+        self.by_input = defaultdict(set)
+        self.by_module = defaultdict(set)
+        for v in self.manifest['variants']:
+            for path in v.get('inputs', {}).values():
+                self.by_input[os.path.abspath(path)].add(v['name'])
+            module = build_assets.LAYOUT_MODULES[v['layout']]
+            self.by_module[str(TOOLS_DIR / f'{module}.py')].add(v['name'])
+        font = build_assets.font_file()
+        self.font = os.path.abspath(font) if font else None
+        self.shared = {str(TOOLS_DIR / f'{m}.py'): m for m in SHARED_MODULES}
+
+    def files(self):
+        paths = {self.manifest_path, *self.by_input, *self.by_module, *self.shared}
+        if self.font:
+            paths.add(self.font)
+        return paths
+
+    def affected(self, changed):
+        """(variant names to re-check, module names to reload) for a set of changed paths."""
+        names = set()
+        modules = []
+        everything = set(self.by_name)
+        for path in changed:
+            if path == self.manifest_path:
+                self.load()
+                names |= set(self.by_name)  # keys tell which ones actually changed
+            elif path in self.shared:
+                modules.append(self.shared[path])
+                names |= everything
+            elif path == self.font:
+                modules.append('fonts')  # drop faces and metrics cached from the old file
+                names |= everything
+            elif path in self.by_module:
+                modules.append(Path(path).stem)
+                names |= self.by_module[path]
+            names |= self.by_input.get(path, set())
+        order = {m: i for i, m in enumerate(SHARED_MODULES)}
+        modules = sorted(set(modules), key=lambda m: order.get(m, len(order)))
+        if any(m in order for m in modules):
+            # Renderers hold references into fonts/raster; reload them too.
+            modules += sorted({build_assets.LAYOUT_MODULES[v['layout']]
+                               for v in self.manifest['variants']} - set(modules))
+        return names, modules
+
+
+class AssetBuilder:
+    def __init__(self, graph):
+        self.graph = graph
+        self.cache = build_assets.load_cache()
+
+    def rebuild(self, names):
+        manifest = self.graph.manifest
+        out_dir = manifest.get('output_dir', os.path.join('assets', 'playstore'))
+        thumb = manifest.get('thumbnail_size', [512, 250])
+        preview = manifest.get('preview_size', [1024, 500])
+        stale = list(build_assets.stale_variants(manifest, self.cache, names))
+        for variant, key in stale:
+            scale = build_assets.variant_scale(variant, manifest)
+            name, written, seconds = build_assets._build(variant, out_dir, thumb, preview, scale)
+            self.cache[name] = {'key': key, 'outputs': {p: d for p, (d, _) in written.items()}}
+            changed = [p for p, (_, outcome) in written.items() if outcome != 'unchanged']
+            print(f"  {name}: {len(changed)} of {len(written)} outputs changed ({seconds:.2f}s)")
+        if stale:
+            atomic_write(build_assets.CACHE_PATH,
+                         json.dumps(self.cache, indent=1, sort_keys=True).encode('utf-8'))
+        return [v['name'] for v, _ in stale]
+
+
+class CodemodRunner:
+    def __init__(self, rule_paths, root='lib'):
+        self.rules = {os.path.abspath(p): Codemod.load(p) for p in rule_paths}
+        self.root = os.path.abspath(root)
+
+    def is_source(self, path):
+        return path.endswith('.dart') and path.startswith(self.root + os.sep)
+
+    def apply(self, paths):
+        touched = 0
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            text, newline = read_source(path)
+            new_text = text
+            for codemod in self.rules.values():
+                new_text, _ = codemod.apply(new_text)
+            if new_text != text:
+                atomic_write(path, encode_source(new_text, newline))
+                print(f'  codemod: {os.path.relpath(path)}')
+                touched += 1
+        return touched
+
+    def handle(self, changed):
+        reloaded = [p for p in changed if p in self.rules]
+        for path in reloaded:
+            try:
+                self.rules[path] = Codemod.load(path)
+            except (ValueError, KeyError) as e:
+                print(f'  {os.path.relpath(path)}: {e}; keeping the previous rules')
+        if reloaded:
+            sources = [os.path.join(d, n) for d, _, files in os.walk(self.root)
+                       for n in files if n.endswith('.dart')]
+        else:
+            sources = [p for p in changed if self.is_source(p)]
+        return self.apply(sorted(sources))
+
+
+def process(batch, graph, builder, codemods):
+    names, modules = graph.affected(batch)
+    for module in modules:
+        if module in sys.modules:
+            importlib.reload(sys.modules[module])
+        else:
+            importlib.import_module(module)
+    if any(m in SHARED_MODULES for m in modules):
+        graph.load()  # the font candidate list may have changed
+    rebuilt = builder.rebuild(names) if names else []
+    touched = codemods.handle(batch) if codemods else 0
+    return rebuilt, touched, modules
+
+
+def make_watcher(files, recursive, poll):
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher({os.path.dirname(f) for f in files}, recursive)
+        except (OSError, AttributeError) as e:
+            print(f'inotify unavailable ({e}); polling instead', file=sys.stderr)
+    return PollingWatcher(files, recursive)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild assets and re-apply codemods on change.')
+    parser.add_argument('--manifest', default=str(build_assets.DEFAULT_MANIFEST))
+    parser.add_argument('--codemod', action='append', default=[], help='rules file to keep applied to lib/')
+    parser.add_argument('--root', default='lib')
+    parser.add_argument('--debounce', type=float, default=0.15, help='seconds of quiet before rebuilding')
+    parser.add_argument('--poll', action='store_true', help='use the stat poller instead of inotify')
+    args = parser.parse_args(argv)
+
+    graph = AssetGraph(args.manifest)
+    builder = AssetBuilder(graph)
+    codemods = CodemodRunner(args.codemod, args.root) if args.codemod else None
+
+    start = time.perf_counter()
+    built = builder.rebuild(set(graph.by_name))  # initial sync; also warms fonts and images
+    print(f'Ready: {len(built)} variant(s) rebuilt ({time.perf_counter() - start:.2f}s). Watching...')
+
+    files = graph.files() | (set(codemods.rules) if codemods else set())
+    watcher = make_watcher(files, [args.root] if codemods else [], args.poll)
+    pending = set()
+    last_event = 0.0
+    try:
+        while True:
+            changed = watcher.wait(args.debounce if pending else 1.0)
+            if changed:
+                pending |= changed
+                last_event = time.monotonic()
+                continue
+            if not pending or time.monotonic() - last_event < args.debounce:
+                continue
+            batch, pending = pending, set()
+            files = graph.files() | (set(codemods.rules) if codemods else set())
+            batch = {p for p in batch if p in files or (codemods and codemods.is_source(p))}
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                rebuilt, touched, modules = process(batch, graph, builder, codemods)
+            except Exception as e:  # a half-saved module or manifest; wait for the next save
+                print(f'{type(e).__name__}: {e}', file=sys.stderr)
+                continue
+            if rebuilt or touched or modules:
+                what = ', '.join(os.path.relpath(p) for p in sorted(batch))
+                print(f'{what}: {len(rebuilt)} variant(s), {touched} source(s) '
+                      f'in {time.perf_counter() - start:.2f}s')
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())